@@ -1,58 +1,182 @@
-import statistics as stats
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import repeat
+import numpy as np
 import matplotlib.pyplot as plt
 
-from src.cnf_flat import random_3sat_flat
+from src.cnf_flat import GENERATOR_VERSION, random_3sat_flat
 from src.DPLL.DPLLFast import DPLLFast
 
+MODES = ("static", "random", "2clause")
+MODE_IDX = {m: i for i, m in enumerate(MODES)}
 
-def par10_time(solve_time: float, time_limit: float) -> float:
-    return 10.0 * time_limit if solve_time >= time_limit else solve_time
+
+def par10_time(solve_time, timed_out, time_limit: float):
+    """
+    PAR-10 score of a solve time, or elementwise over an array of them:
+    10x the limit where the solver reported a timeout, the time otherwise.
+    """
+    t = np.asarray(solve_time, dtype=np.float64)
+    return np.where(timed_out, 10.0 * time_limit, t)
 
 
-def run_3way_experiment(N_vals, ratios, num_trials=100, time_limit=0.5, base_seed=12345):
+def par10_summary(solve_times, timed_out, time_limit: float):
     """
+    Vectorized reduction of solve times and the solver's timed_out flags
+    along the last axis (one row per mode for a 2-D input).
+
     Returns:
-      perf[N][r][mode] = PAR10 mean
-      aux stats also included
+      (par10_mean, timeout_rate)
     """
-    modes = ["static", "random", "2clause"]
-    perf = {N: {r: {} for r in ratios} for N in N_vals}
+    timed_out = np.asarray(timed_out, dtype=bool)
+    return par10_time(solve_times, timed_out, time_limit).mean(axis=-1), timed_out.mean(axis=-1)
+
 
-    for N in N_vals:
-        for r in ratios:
-            L = int(N * r)
+@lru_cache(maxsize=256)
+def gen_instance(N: int, L: int, seed: int, cache_dir: str | None = None):
+    """
+    random_3sat_flat(L, N, seed), memoized in-process and, if `cache_dir`
+    is given, on disk as `{cache_dir}/v{GENERATOR_VERSION}/{N}_{L}_{seed}.npz`
+    so reruns of a sweep skip generation entirely (and never pick up
+    instances from an older generator). Cache files are written to a
+    temporary name and renamed, so an interrupted run leaves no truncated
+    entry behind.
+    """
+    path = None
+    if cache_dir is not None:
+        cache_dir = os.path.join(cache_dir, f"v{GENERATOR_VERSION}")
+        path = os.path.join(cache_dir, f"{N}_{L}_{seed}.npz")
+        if os.path.exists(path):
+            with np.load(path) as z:
+                return z["lits"].astype(np.int32), z["offsets"].astype(np.int32)
+
+    lits, offsets = random_3sat_flat(L=L, N=N, seed=seed)
+
+    if path is not None:
+        os.makedirs(cache_dir, exist_ok=True)
+        # per-process temp name: concurrent runs may share the cache
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            np.savez_compressed(f, lits=lits, offsets=offsets)
+        os.replace(tmp, path)
+    return lits, offsets
+
+
+def _solve_trial(seed, N, L, modes, time_limit, cache_dir=None):
+    """
+    Worker: build the instance for `seed` once and solve it with every mode,
+    rewinding the same solver between modes.
 
-            # per mode accumulators
-            par10_sums = {m: 0.0 for m in modes}
-            timeouts = {m: 0 for m in modes}
+    Only ints/strings cross the process boundary; the instance is
+    regenerated inside the worker from its seed.
+
+    Returns:
+      (solve times, timed_out flags), both lists in the order of `modes`
+    """
+    lits, offsets = gen_instance(N, L, seed, cache_dir)
+    solver = DPLLFast(lits, offsets, num_vars=N)
+    times, timed_out = [], []
+    for i, mode in enumerate(modes):
+        if i:
+            solver.reset()
+        solver.solve(time_limit=time_limit, branch_mode=mode, seed=seed + 999)
+        times.append(solver.solve_time)
+        timed_out.append(solver.timed_out)
+    return times, timed_out
+
+
+def _ranking_decided(times, timed_out, time_limit: float, z: float = 1.96) -> bool:
+    """
+    True once the PAR-10 confidence intervals (mean ± z·sem) of all modes
+    are pairwise disjoint, i.e. more trials cannot change their ordering.
+
+    times, timed_out: (len(MODES), n) solve times and timeout flags.
+    """
+    p = par10_time(times, timed_out, time_limit)
+    n = p.shape[1]
+    if n < 2:
+        return False
+    mean = p.mean(axis=1)
+    half = z * p.std(axis=1, ddof=1) / np.sqrt(n)
+    order = np.argsort(mean)
+    return bool(np.all(mean[order[:-1]] + half[order[:-1]] < mean[order[1:]] - half[order[1:]]))
+
+
+def run_3way_experiment(N_vals, ratios, num_trials=100, time_limit=0.5, base_seed=12345,
+                        workers=None, cache_dir=None, batch_size=10):
+    """
+    Returns:
+      perf = {
+        "par10_mean":   ndarray (len(N_vals), len(ratios), len(MODES)),
+        "timeout_rate": ndarray (len(N_vals), len(ratios), len(MODES)),
+        "L":            ndarray (len(N_vals), len(ratios)),
+        "trials":       ndarray (len(N_vals), len(ratios)), trials actually run
+      }
+      indexed as [N_vals.index(N), ratios.index(r), MODE_IDX[mode]].
+
+    Trials are independent, so they are fanned out over a process pool
+    (`workers` processes, default os.cpu_count()). Instances are cached
+    under `cache_dir` when given (see gen_instance).
+
+    Trials run in batches of `batch_size`; once the modes' PAR-10 ranking
+    is statistically decided (see _ranking_decided) the remaining trials of
+    that (N, r) point are skipped. batch_size=None always runs num_trials.
+    """
+    shape = (len(N_vals), len(ratios), len(MODES))
+    perf = {
+        "par10_mean": np.empty(shape),
+        "timeout_rate": np.empty(shape),
+        "L": np.empty(shape[:2], dtype=np.int64),
+        "trials": np.empty(shape[:2], dtype=np.int64),
+    }
+    par10, tout = perf["par10_mean"], perf["timeout_rate"]
+    workers = workers or os.cpu_count() or 1
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for i, N in enumerate(N_vals):
+            for j, r in enumerate(ratios):
+                L = int(N * r)
+                perf["L"][i, j] = L
+
+                # per mode solve times and timeout flags, reduced once all
+                # trials are in
+                times = np.empty((len(MODES), num_trials))
+                timed_out = np.empty((len(MODES), num_trials), dtype=bool)
 
-            for t in range(num_trials):
                 # fixed seed so each mode sees *exactly* the same instance
-                seed = base_seed + (N * 10_000) + int(r * 100) * 1000 + t
-                lits, offsets = random_3sat_flat(L=L, N=N, seed=seed)
-
-                for mode in modes:
-                    solver = DPLLFast(lits, offsets, num_vars=N)
-                    model = solver.solve(time_limit=time_limit, branch_mode=mode, seed=seed + 999)
-
-                    par10_sums[mode] += par10_time(solver.solve_time, time_limit)
-                    if solver.solve_time >= time_limit:
-                        timeouts[mode] += 1
-
-            for mode in modes:
-                perf[N][r][mode] = {
-                    "par10_mean": par10_sums[mode] / num_trials,
-                    "timeout_rate": timeouts[mode] / num_trials,
-                    "L": L,
-                }
-
-            print(
-                f"N={N} r={r:.1f} | "
-                f"PAR10 static={perf[N][r]['static']['par10_mean']:.4f} "
-                f"random={perf[N][r]['random']['par10_mean']:.4f} "
-                f"2cl={perf[N][r]['2clause']['par10_mean']:.4f}",
-                flush=True
-            )
+                seeds = [base_seed + (N * 10_000) + int(r * 100) * 1000 + t
+                         for t in range(num_trials)]
+                # keep every worker busy even when batches are small
+                step = max(batch_size, workers) if batch_size else num_trials
+                chunksize = max(1, step // (4 * workers))
+
+                done = 0
+                while done < num_trials:
+                    batch = seeds[done:done + step]
+                    for t, trial in enumerate(pool.map(
+                        _solve_trial, batch, repeat(N), repeat(L), repeat(MODES), repeat(time_limit),
+                        repeat(cache_dir),
+                        chunksize=chunksize,
+                    ), start=done):
+                        times[:, t], timed_out[:, t] = trial
+                    done += len(batch)
+
+                    if batch_size and _ranking_decided(times[:, :done], timed_out[:, :done], time_limit):
+                        break
+
+                perf["trials"][i, j] = done
+                par10[i, j], tout[i, j] = par10_summary(times[:, :done], timed_out[:, :done], time_limit)
+
+                print(
+                    f"N={N} r={r:.1f} | "
+                    f"PAR10 static={par10[i, j, MODE_IDX['static']]:.4f} "
+                    f"random={par10[i, j, MODE_IDX['random']]:.4f} "
+                    f"2cl={par10[i, j, MODE_IDX['2clause']]:.4f} "
+                    f"trials={done}",
+                    flush=True
+                )
 
     return perf
 
@@ -63,19 +187,19 @@ def plot_ratio_curves(perf, N_vals, ratios):
       (static/random) and (static/2clause) ratio vs L/N
     Lower is better (static faster).
     """
+    # (len(N_vals), len(ratios)) PAR-10 tables, one per mode
+    par10 = perf["par10_mean"]
+    S = par10[:, :, MODE_IDX["static"]]
+    R = par10[:, :, MODE_IDX["random"]]
+    C = par10[:, :, MODE_IDX["2clause"]]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        y_sr = np.where(R > 0, S / R, np.nan)
+        y_s2 = np.where(C > 0, S / C, np.nan)
+
     plt.figure()
-    for N in N_vals:
-        y_sr = []
-        y_s2 = []
-        for r in ratios:
-            s = perf[N][r]["static"]["par10_mean"]
-            rnd = perf[N][r]["random"]["par10_mean"]
-            two = perf[N][r]["2clause"]["par10_mean"]
-            y_sr.append(s / rnd if rnd > 0 else float("nan"))
-            y_s2.append(s / two if two > 0 else float("nan"))
-
-        plt.plot(ratios, y_sr, marker="o", label=f"N={N}: static/random")
-        plt.plot(ratios, y_s2, marker="o", label=f"N={N}: static/2clause")
+    for i, N in enumerate(N_vals):
+        plt.plot(ratios, y_sr[i], marker="o", label=f"N={N}: static/random")
+        plt.plot(ratios, y_s2[i], marker="o", label=f"N={N}: static/2clause")
 
     plt.axhline(1.0)  # equal performance reference
     plt.xlabel("L/N")
@@ -88,6 +212,12 @@ def plot_ratio_curves(perf, N_vals, ratios):
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Static vs random vs 2clause branching sweep.")
+    parser.add_argument("--cache-dir", default=None,
+                        help="cache generated instances under this directory "
+                             "(e.g. ~/.cache/3sat); off by default")
+    args = parser.parse_args()
+
     N_vals = [85, 110]               # or whatever you want
     ratios = [i / 10 for i in range(30, 62, 2)]  # 3.0..6.0 step 0.2
 
@@ -96,7 +226,8 @@ def main():
         ratios=ratios,
         num_trials=100,
         time_limit=2,
-        base_seed=12345
+        base_seed=12345,
+        cache_dir=os.path.expanduser(args.cache_dir) if args.cache_dir else None,
     )
 
     plot_ratio_curves(perf, N_vals, ratios)
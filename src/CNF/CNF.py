@@ -1,3 +1,14 @@
+import mmap
+import os
+import re
+from itertools import chain
+
+import numpy as np
+
+# start of a non-clause line: comment, problem line, or SATLIB '%' end marker
+_MARKER_RE = re.compile(rb"^[ \t]*[cp%]", re.MULTILINE)
+
+
 class CNF:
     def __init__(self, dimacs_file: str):
         """
@@ -5,39 +16,86 @@ class CNF:
 
         - Literals are stored as ints:
             +k means variable k, -k means ¬k.
-        - Clauses are lists of ints.
+        - Clauses are tuples of ints (immutable, so one instance can be
+          shared by several solvers).
+        - Clauses are 0-terminated and may span several lines.
         """
         self.clauses = []
         self.numVars = 0
         self.numClauses = 0
 
-        with open(dimacs_file, "r", encoding="utf-8") as f:
-            for raw in f:
-                line = raw.strip()
-                if not line:
-                    continue
-                if line.startswith("c"):
-                    continue
-                if line.startswith("p"):
-                    parts = line.split()
-                    # p cnf <numVars> <numClauses>
-                    self.numVars = int(parts[2])
-                    self.numClauses = int(parts[3])
-                    continue
-
-                # Clause line: ints ending with 0
-                lits = []
-                for tok in line.split():
-                    lit = int(tok)
-                    if lit == 0:
-                        break
-                    lits.append(lit)
-                if lits:
-                    self.clauses.append(lits)
-
-        # Fallback if header didn't set numVars
+        # DIMACS is ASCII: scan the raw bytes through mmap, visiting only the
+        # comment/header lines in Python and keeping the clause spans between
+        # them as byte slices.
+        body = []
+        with open(dimacs_file, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                data = b""
+            else:
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            try:
+                pos = 0
+                for m in _MARKER_RE.finditer(data):
+                    body.append(data[pos:m.start()])
+                    end = data.find(b"\n", m.start())
+                    if end == -1:
+                        end = len(data)
+                    line = data[m.start():end].strip()
+                    if line.startswith(b"p"):
+                        parts = line.split()
+                        # p cnf <numVars> <numClauses>
+                        self.numVars = int(parts[2])
+                        self.numClauses = int(parts[3])
+                    pos = end + 1
+                body.append(data[pos:])
+            finally:
+                if isinstance(data, mmap.mmap):
+                    data.close()
+
+        # Clause region: parsed in one numpy call, clauses end at 0
+        flat = np.fromstring(b" ".join(body), dtype=np.int32, sep=" ")
+        ends = np.flatnonzero(flat == 0)
+        if flat.size and flat[-1] != 0:
+            # last clause missing its terminating 0
+            ends = np.append(ends, flat.size)
+        starts = np.concatenate(([0], ends[:-1] + 1))
+        keep = ends > starts  # drop empty clauses
+        starts, ends = starts[keep].tolist(), ends[keep].tolist()
+
+        # exact clause count is known here, so size the list once; cut the
+        # clauses out of one boxed copy rather than slicing numpy per clause
+        lits = flat.tolist()
+        self.clauses = [None] * len(starts)
+        for k in range(len(starts)):
+            self.clauses[k] = tuple(lits[starts[k]:ends[k]])
+
+        self._fill_counts(flat)
+
+    @classmethod
+    def from_dimacs(cls, dimacs_file: str) -> "CNF":
+        """Same as CNF(dimacs_file)."""
+        return cls(dimacs_file)
+
+    @classmethod
+    def from_clauses(cls, clauses: list[list[int]], num_vars: int | None = None) -> "CNF":
+        """
+        Wrap in-memory clauses (same int-literal convention) without going
+        through a file. num_vars defaults to the largest variable used.
+        """
+        cnf = cls.__new__(cls)
+        cnf.clauses = clauses
+        cnf.numVars = num_vars or 0
+        cnf.numClauses = 0
+        cnf._fill_counts()
+        return cnf
+
+    def _fill_counts(self, flat: np.ndarray | None = None):
+        # Fallback if header didn't set numVars: largest |lit|, one C-level
+        # reduction over the flat literals
         if self.numVars == 0 and self.clauses:
-            self.numVars = max(abs(l) for c in self.clauses for l in c)
+            if flat is None:
+                flat = np.fromiter(chain.from_iterable(self.clauses), dtype=np.int64)
+            self.numVars = int(np.abs(flat).max())
         if self.numClauses == 0:
             self.numClauses = len(self.clauses)
 
@@ -1,15 +1,32 @@
 # src/DPLL/DPLL.py
+import multiprocessing as mp
+import os
+import random
 import time
-from collections import defaultdict, deque
+from array import array
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import chain
+
+import numpy as np
+
 from ..CNF.CNF import CNF
 
 
+def _lit_idx(lit: int) -> int:
+    """
+    Dense index of a literal: 2*var for +var, 2*var+1 for -var.
+    Used to address per-literal lists without hashing.
+    """
+    return (lit << 1) if lit > 0 else ((-lit) << 1) | 1
+
+
 class DPLL:
     """
     DPLL with:
       - immutable CNF (integer literals)
       - assignment + trail for backtracking
       - watched literals for efficient unit propagation
+      - VSIDS branching over an indexed max-heap of variables
       - instrumentation: split_count, solve_time
 
     You can build it from:
@@ -29,46 +46,92 @@ class DPLL:
 
         if clauses is not None:
             # in-memory mode
-            self.clauses = clauses
-            if num_vars is not None:
-                self.num_vars = num_vars
-            else:
-                self.num_vars = max(abs(l) for c in clauses for l in c)
+            base = CNF.from_clauses(clauses, num_vars)
         else:
             # file-based mode
-            base = CNF(dimacs_file)
-            self.clauses = base.getCNFList()
-            self.num_vars = base.numVars
-
-        # assignment[var] in {True, False, None}; index 0 unused
-        self.assignment = [None] * (self.num_vars + 1)
-        # trail of (var, value)
-        self.trail: list[tuple[int, bool]] = []
-
-        # simple static frequency heuristic
-        self.var_freq = [0] * (self.num_vars + 1)
-        for clause in self.clauses:
-            for lit in clause:
-                self.var_freq[abs(lit)] += 1
-
-
-                # cheap branching: static literal frequency
-        self.lit_count = defaultdict(int)   # lit -> count
-        self._all_lits = []                 # cache unique literals for iteration
-        for clause in self.clauses:
-            for lit in clause:
-                self.lit_count[lit] += 1
-
-        self._all_lits = list(self.lit_count.keys())
+            base = CNF.from_dimacs(dimacs_file)
+        self._load(base)
 
-
-        # watched-literal structures
+    def load(self, clauses: list[list[int]], num_vars: int | None = None) -> None:
+        """
+        Replace the formula with new in-memory clauses, reusing this
+        solver's per-literal lists when the variable count is unchanged
+        (e.g. a sweep of trials at fixed N).
+        """
+        self._load(CNF.from_clauses(clauses, num_vars))
+
+    def _load(self, base: CNF) -> None:
+        """Build all formula-dependent structures from `base`, then _reset()."""
+        self.clauses = base.getCNFList()
+        self.num_vars = base.numVars
+
+        # static occurrence counts, from one flat int32 copy of the literals:
+        # var_freq[var] seeds VSIDS, lit_count[lit] (signed indexing, like
+        # assignment) picks the branch polarity
+        n = self.num_vars
+        flat = np.fromiter(chain.from_iterable(self.clauses), dtype=np.int32,
+                           count=sum(map(len, self.clauses)))
+        self.var_freq = np.bincount(np.abs(flat), minlength=n + 1).tolist()
+        self.lit_count = np.roll(np.bincount(flat + n, minlength=2 * n + 1), -n).tolist()
+
+        # watched-literal structures; watchlist is indexed by _lit_idx(lit)
+        n_lits = 2 * (self.num_vars + 1)
         self.watch_pos: list[tuple[int, int]] = []
-        self.watchlist: dict[int, list[int]] = defaultdict(list)
+        if getattr(self, "n_lits", None) == n_lits:
+            # reloaded at the same size: empty the per-literal lists in place
+            for lists in (self.watchlist, self.bin_watches, self.occurs):
+                for entries in lists:
+                    entries.clear()
+        else:
+            self.n_lits = n_lits
+            # each entry is (clause index, blocker): blocker is another literal
+            # of the clause; if it is already true the clause is skipped unread
+            self.watchlist: list[list[tuple[int, int]]] = [[] for _ in range(n_lits)]
+            # binary clauses: bin_watches[_lit_idx(lit)] holds (other lit, ci);
+            # when lit becomes false, other lit is implied directly
+            self.bin_watches: list[list[tuple[int, int]]] = [[] for _ in range(n_lits)]
+
+            # satisfied-clause bookkeeping: occurs[lit] lists the clauses that
+            # contain lit (signed indexing, like assignment), sat_count[ci] the
+            # number of true literals in clause ci; the formula is satisfied
+            # once n_unsat_clauses reaches 0
+            self.occurs: list[list[int]] = [[] for _ in range(2 * self.num_vars + 1)]
+        self.has_empty_clause = False
         self._init_watches()
 
+        self._reset()
+
+    def _reset(self, seed: int | None = None) -> None:
+        """
+        (Re)initialise all per-search state; seed as in solve().
+        """
+        # assignment[lit]: 0 unassigned, +1 true, -1 false, indexed by the
+        # signed literal (negative indexing puts -v at slot 2n+1-v), so
+        # assignment[-v] == -assignment[v] and hot loops skip abs()/sign
+        # decoding; for var > 0 it reads like the DPLLFast array. Slot 0 unused.
+        self.assignment = array('b', [0]) * (2 * self.num_vars + 1)
+        # trail of literals made true, in assignment order
+        self.trail: list[int] = []
         # pointer into trail for propagation
         self.last_propagated = 0
+        # clause index of the last conflict found by propagate(), or -1
+        self.conflict_clause = -1
+
+        self.sat_count = [0] * len(self.clauses)
+        self.n_unsat_clauses = len(self.clauses)
+
+        # VSIDS: activity per var, seeded from var_freq, and a binary max-heap
+        # of candidate vars; heap_pos[var] is var's slot in heap or -1.
+        # phase saving: saved_phase[var] is the sign var last had before it
+        # was undone (+1/-1), 0 if never assigned yet
+        self.saved_phase = array('b', [0]) * (self.num_vars + 1)
+        if seed is None:
+            self._init_vsids()
+        else:
+            rng = random.Random(seed)
+            self._init_vsids(rng)
+            for v in range(1, self.num_vars + 1):
+                self.saved_phase[v] = rng.choice((1, -1))
 
         # instrumentation
         self.split_count = 0
@@ -77,45 +140,179 @@ class DPLL:
     def _init_watches(self) -> None:
         """
         For each clause, choose two watched literals and
-        populate watch_pos and watchlist.
+        populate watch_pos and watchlist (bin_watches for binary clauses).
+        The same pass fills occurs and flags empty clauses.
         """
+        watch_pos = self.watch_pos
+        watchlist = self.watchlist
+        bin_watches = self.bin_watches
+        occurs = self.occurs
+
         for ci, clause in enumerate(self.clauses):
-            if len(clause) == 0:
-                self.watch_pos.append((0, 0))
-                continue
-            elif len(clause) == 1:
-                self.watch_pos.append((0, 0))
+            for lit in clause:
+                occurs[lit].append(ci)
+
+            size = len(clause)
+            if size == 0:
+                watch_pos.append((0, 0))
+                self.has_empty_clause = True
+            elif size == 1:
+                watch_pos.append((0, 0))
                 lit = clause[0]
-                self.watchlist[lit].append(ci)
+                watchlist[_lit_idx(lit)].append((ci, lit))
+            elif size == 2:
+                # binary clauses never move their watches: keep them apart
+                watch_pos.append((0, 1))
+                lit1, lit2 = clause
+                bin_watches[_lit_idx(lit1)].append((lit2, ci))
+                bin_watches[_lit_idx(lit2)].append((lit1, ci))
             else:
-                self.watch_pos.append((0, 1))
+                watch_pos.append((0, 1))
                 lit1, lit2 = clause[0], clause[1]
-                self.watchlist[lit1].append(ci)
-                self.watchlist[lit2].append(ci)
+                watchlist[_lit_idx(lit1)].append((ci, lit2))
+                watchlist[_lit_idx(lit2)].append((ci, lit1))
+
+    # ---------- VSIDS activity heap ----------
+
+    VAR_DECAY = 0.95
+    RESCALE_LIMIT = 1e100
+
+    def _init_vsids(self, rng: random.Random | None = None) -> None:
+        """
+        Reset activities to the static var_freq and rebuild the heap.
+        Vars that occur in no clause are never branched on.
+        With rng, activities get a jitter in [0, 1) that reorders ties.
+        """
+        self.activity = [float(f) for f in self.var_freq]
+        if rng is not None:
+            self.activity = [a + rng.random() for a in self.activity]
+        self.var_inc = 1.0
+        self.heap_pos = [-1] * (self.num_vars + 1)
+        self.heap = []
+        for var in range(1, self.num_vars + 1):
+            if self.var_freq[var]:
+                self._heap_insert(var)
+
+    def _sift_up(self, i: int) -> None:
+        heap = self.heap
+        pos = self.heap_pos
+        act = self.activity
+        var = heap[i]
+        a = act[var]
+        while i > 0:
+            parent = (i - 1) >> 1
+            pvar = heap[parent]
+            if act[pvar] >= a:
+                break
+            heap[i] = pvar
+            pos[pvar] = i
+            i = parent
+        heap[i] = var
+        pos[var] = i
+
+    def _sift_down(self, i: int) -> None:
+        heap = self.heap
+        pos = self.heap_pos
+        act = self.activity
+        n = len(heap)
+        var = heap[i]
+        a = act[var]
+        while True:
+            child = 2 * i + 1
+            if child >= n:
+                break
+            right = child + 1
+            if right < n and act[heap[right]] > act[heap[child]]:
+                child = right
+            cvar = heap[child]
+            if act[cvar] <= a:
+                break
+            heap[i] = cvar
+            pos[cvar] = i
+            i = child
+        heap[i] = var
+        pos[var] = i
+
+    def _heap_insert(self, var: int) -> None:
+        if self.heap_pos[var] >= 0:
+            return
+        self.heap.append(var)
+        self._sift_up(len(self.heap) - 1)
+
+    def _heap_pop(self) -> int:
+        heap = self.heap
+        top = heap[0]
+        last = heap.pop()
+        self.heap_pos[top] = -1
+        if heap:
+            heap[0] = last
+            self._sift_down(0)
+        return top
+
+    def bump(self, var: int) -> None:
+        """
+        Increase var's activity by the current increment, rescaling all
+        activities when they grow too large.
+        """
+        act = self.activity
+        act[var] += self.var_inc
+        if act[var] > self.RESCALE_LIMIT:
+            scale = 1.0 / self.RESCALE_LIMIT
+            for v in range(1, self.num_vars + 1):
+                act[v] *= scale
+            self.var_inc *= scale
+        i = self.heap_pos[var]
+        if i >= 0:
+            self._sift_up(i)
+
+    def decay(self) -> None:
+        """
+        Decay all activities (implemented by growing the bump increment).
+        """
+        self.var_inc /= self.VAR_DECAY
 
     def assign_literal(self, lit: int) -> bool:
         """
         Assign a literal. Returns False if this conflicts with an existing assignment,
         True otherwise.
         """
-        var = abs(lit)
-        val = lit > 0  # True if positive, False if negative
-
-        current = self.assignment[var]
-        if current is not None:
-            return current == val
-
-        self.assignment[var] = val
-        self.trail.append((var, val))
+        current = self.assignment[lit]
+        if current != 0:
+            return current == 1
+
+        self.assignment[lit] = 1
+        self.assignment[-lit] = -1
+        self.trail.append(lit)
+
+        sat_count = self.sat_count
+        for ci in self.occurs[lit]:
+            if sat_count[ci] == 0:
+                self.n_unsat_clauses -= 1
+            sat_count[ci] += 1
         return True
 
     def undo_to(self, trail_len: int) -> None:
         """
         Undo assignments back to a given trail length.
         """
+        sat_count = self.sat_count
+        occurs = self.occurs
+        saved_phase = self.saved_phase
+
         while len(self.trail) > trail_len:
-            var, _ = self.trail.pop()
-            self.assignment[var] = None
+            lit = self.trail.pop()
+            self.assignment[lit] = 0
+            self.assignment[-lit] = 0
+            if lit > 0:
+                saved_phase[lit] = 1
+            else:
+                saved_phase[-lit] = -1
+            for ci in occurs[lit]:
+                sat_count[ci] -= 1
+                if sat_count[ci] == 0:
+                    self.n_unsat_clauses += 1
+            # popped from the heap when assigned; make it a candidate again
+            self._heap_insert(lit if lit > 0 else -lit)
 
         if self.last_propagated > trail_len:
             self.last_propagated = trail_len
@@ -128,26 +325,53 @@ class DPLL:
             True  if no conflict.
             False if a conflict (empty clause) is found.
         """
-        queue = deque()
-
-        # New assignments since last propagation
-        for idx in range(self.last_propagated, len(self.trail)):
-            var, val = self.trail[idx]
-            false_lit = -var if val else var
-            queue.append(false_lit)
-
-        self.last_propagated = len(self.trail)
+        # locals instead of attribute lookups in the inner loops
+        clauses = self.clauses
+        watch_pos = self.watch_pos
+        wl = self.watchlist
+        bw = self.bin_watches
+        assignment = self.assignment
+        assign_literal = self.assign_literal
+        trail = self.trail
+
+        # the trail doubles as the propagation queue: every literal past
+        # last_propagated still has to be visited, and units forced below
+        # are appended to it by assign_literal
+        while self.last_propagated < len(trail):
+            false_lit = -trail[self.last_propagated]
+            self.last_propagated += 1
+            fi = _lit_idx(false_lit)
+
+            # binary clauses: the other literal is the only candidate
+            for other_lit, ci in bw[fi]:
+                val = assignment[other_lit]
+                if val > 0:
+                    continue
+                if val < 0 or not assign_literal(other_lit):
+                    self.conflict_clause = ci
+                    return False
 
-        while queue:
-            false_lit = queue.popleft()
-            clauses_watching = self.watchlist.get(false_lit)
-            if not clauses_watching:
+            ws = wl[fi]
+            if not ws:
                 continue
 
-            # iterate over a snapshot because we'll mutate the list
-            for ci in clauses_watching[:]:
-                clause = self.clauses[ci]
-                w1_idx, w2_idx = self.watch_pos[ci]
+            # Walk the watch list in place with a read index i and a write
+            # index j: entries that stay are copied down to j, entries whose
+            # watch moves elsewhere are simply not copied (O(1) removal).
+            i = j = 0
+            n = len(ws)
+            while i < n:
+                entry = ws[i]
+                i += 1
+                ci, blocker = entry
+                if assignment[blocker] > 0:
+                    # satisfied by the blocker: keep the entry as is
+                    ws[j] = entry
+                    j += 1
+                    continue
+
+                clause = clauses[ci]
+                w1_idx, w2_idx = watch_pos[ci]
                 w1_lit = clause[w1_idx]
                 w2_lit = clause[w2_idx]
 
@@ -159,7 +383,7 @@ class DPLL:
                     false_idx, other_idx = w2_idx, w1_idx
                     other_lit = w1_lit
                 else:
-                    # clause no longer actually watches false_lit
+                    # clause no longer actually watches false_lit: drop entry
                     continue
 
                 # Try to find a replacement literal to watch that is not known-false
@@ -167,20 +391,14 @@ class DPLL:
                 for k, L in enumerate(clause):
                     if k == w1_idx or k == w2_idx:
                         continue
-                    var = abs(L)
-                    val = self.assignment[var]
-                    is_false = (val is not None) and (
-                        (L > 0 and not val) or (L < 0 and val)
-                    )
-                    if not is_false:
+                    if assignment[L] >= 0:
                         # move watch from false_lit to L
                         if false_idx == w1_idx:
-                            self.watch_pos[ci] = (k, other_idx)
+                            watch_pos[ci] = (k, other_idx)
                         else:
-                            self.watch_pos[ci] = (other_idx, k)
+                            watch_pos[ci] = (other_idx, k)
 
-                        self.watchlist[false_lit].remove(ci)
-                        self.watchlist[L].append(ci)
+                        wl[_lit_idx(L)].append((ci, other_lit))
 
                         found_replacement = True
                         break
@@ -188,24 +406,31 @@ class DPLL:
                 if found_replacement:
                     continue
 
-                # No replacement found: other_lit is only candidate
-                var = abs(other_lit)
-                val = self.assignment[var]
+                # clause keeps watching false_lit, blocked by other_lit
+                ws[j] = (ci, other_lit)
+                j += 1
 
-                if val is not None:
-                    is_false = (other_lit > 0 and not val) or (other_lit < 0 and val)
-                    if is_false:
-                        # both watched literals false: conflict
+                # No replacement found: other_lit is only candidate
+                val = assignment[other_lit]
+
+                if val != 0:
+                    if val < 0:
+                        # both watched literals false: conflict;
+                        # keep the unvisited tail of the watch list
+                        ws[j:] = ws[i:]
+                        self.conflict_clause = ci
                         return False
                     else:
                         # clause is satisfied by other_lit
                         continue
                 else:
                     # Unit clause: force other_lit to True
-                    if not self.assign_literal(other_lit):
+                    if not assign_literal(other_lit):
+                        ws[j:] = ws[i:]
+                        self.conflict_clause = ci
                         return False
-                    false2 = -var if other_lit > 0 else var
-                    queue.append(false2)
+
+            del ws[j:]
 
         return True
 
@@ -213,91 +438,123 @@ class DPLL:
         """
         Check if the formula is SAT, UNSAT, or unknown.
         """
-        any_undecided = False
-
-        for clause in self.clauses:
-            clause_value = False
-            clause_undecided = False
+        # sat_count already tracks which clauses hold a true literal, so
+        # only the still-unsatisfied ones need scanning
+        if self.n_unsat_clauses == 0:
+            return True
 
-            for lit in clause:
-                var = abs(lit)
-                val = self.assignment[var]
+        value_of = self.assignment.__getitem__
 
-                if val is None:
-                    clause_undecided = True
-                else:
-                    if (lit > 0 and val) or (lit < 0 and not val):
-                        clause_value = True
-                        break
-
-            if clause_value:
+        for clause, n_sat in zip(self.clauses, self.sat_count):
+            if n_sat:
                 continue
-
-            if not clause_undecided:
+            # literal values are +1/0/-1 (true/unassigned/false), and no
+            # literal here is true, so the clause is falsified iff max < 0
+            if max(map(value_of, clause), default=-1) < 0:
                 return False  # UNSAT
 
-            any_undecided = True
-
-        if any_undecided:
-            return None
-        else:
-            return True
+        return None
 
     def choose_branch_literal(self) -> int | None:
         """
-        Cheap branching heuristic:
-        pick the literal with the largest *static* occurrence count
-        among variables that are still unassigned.
+        VSIDS branching: pop the most active unassigned variable off the
+        heap (assigned vars are skipped lazily and reinserted by undo_to).
+        Polarity is the saved phase, or the static literal count for vars
+        that were never assigned.
         """
         assignment = self.assignment
         lit_count = self.lit_count
+        saved_phase = self.saved_phase
+        heap = self.heap
 
-        best_lit = None
-        best_score = -1
-
-        for lit in self._all_lits:
-            var = abs(lit)
-            if assignment[var] is not None:
+        while heap:
+            var = self._heap_pop()
+            if assignment[var] != 0:
                 continue
-            score = lit_count[lit]
-            if score > best_score:
-                best_score = score
-                best_lit = lit
+            phase = saved_phase[var]
+            if phase == 0:
+                phase = 1 if lit_count[var] >= lit_count[-var] else -1
+            return var if phase > 0 else -var
 
-        return best_lit
+        return None
 
-    def solve(self):
+    def solve(self, seed: int | None = None, stop=None):
         """
         Solve the CNF via DPLL.
 
+        seed: None for the default deterministic search; otherwise
+              a seeded variant (jittered activities, random initial phases).
+        stop: optional event (anything with is_set()); the search gives up
+              and returns None once it is set, polled every STOP_POLL conflicts.
+
         Returns:
             dict[int, bool] | None:
                 - dict mapping var -> bool if SAT,
-                - None if UNSAT.
+                - None if UNSAT (or stopped).
 
         Side effects:
             - self.split_count: # of splitting rule applications
             - self.solve_time: elapsed seconds
         """
-        # reset per-run state
-        return self.solve_iterative()
+        return self.solve_iterative(seed, stop)
+
+    def solve_portfolio(self, n: int | None = None):
+        """
+        Race n configurations of this formula in separate processes
+        (default os.cpu_count()): the default search plus seeded variants
+        (seeds 1..n-1). The first to finish wins and the others are told
+        to stop.
+
+        Returns the winner's model (None if UNSAT), like solve().
+
+        Side effects:
+            - self.split_count, self.solve_time: the winner's
+            - self.portfolio_winner: the winning seed (None = default search)
+        """
+        n = n or os.cpu_count() or 1
+        seeds = [None] + list(range(1, n))
+        cancel = mp.Event()
+
+        with ProcessPoolExecutor(max_workers=n, initializer=_portfolio_init,
+                                 initargs=(cancel,)) as pool:
+            futures = [pool.submit(_portfolio_worker, self.clauses, self.num_vars, s)
+                       for s in seeds]
+            done, _ = wait(futures, return_when=FIRST_COMPLETED)
+            cancel.set()
+            seed, model, splits, solve_time = next(iter(done)).result()
+
+        self.portfolio_winner = seed
+        self.split_count = splits
+        self.solve_time = solve_time
+        return model
+
+    def _model(self) -> dict[int, bool]:
+        """
+        Current assignment as var -> bool; unassigned vars read as False.
+        """
+        n = self.num_vars
+        return dict(zip(range(1, n + 1), [v == 1 for v in self.assignment[1:n + 1]]))
 
-    def solve_iterative(self):
+    STOP_POLL = 256
+
+    def solve_iterative(self, seed: int | None = None, stop=None):
         """
         Iterative DPLL search using an explicit stack instead of recursion.
+        seed/stop as in solve().
 
         Returns:
             dict[int, bool] | None
         """
-        # reset per-run state
-        self.split_count = 0
-        self.solve_time = 0.0
-        self.last_propagated = 0
-        self.trail.clear()
-        self.assignment = [None] * (self.num_vars + 1)
+        self._reset(seed)
+        conflicts = 0
 
         start = time.perf_counter()
 
+        if self.has_empty_clause:
+            # an empty clause can never be satisfied
+            self.solve_time = time.perf_counter() - start
+            return None
+
         # Each stack frame: (branch_lit, trail_mark, flipped)
         # flipped=False means we have not tried the opposite branch yet.
         stack: list[tuple[int, int, bool]] = []
@@ -305,6 +562,16 @@ class DPLL:
         while True:
             # propagate until fixpoint / conflict
             if not self.propagate():
+                # bump the vars of the conflicting clause, then decay
+                for lit in self.clauses[self.conflict_clause]:
+                    self.bump(lit if lit > 0 else -lit)
+                self.decay()
+
+                conflicts += 1
+                if stop is not None and conflicts % self.STOP_POLL == 0 and stop.is_set():
+                    self.solve_time = time.perf_counter() - start
+                    return None
+
                 # conflict: backtrack
                 while stack:
                     branch_lit, mark, flipped = stack.pop()
@@ -324,20 +591,15 @@ class DPLL:
                 # continue main loop after assigning opposite branch
                 continue
 
-            status = self.check_status()
-            if status is True:
-                self.solve_time = time.perf_counter() - start
-                return {v: bool(self.assignment[v]) for v in range(1, self.num_vars + 1)}
-            if status is False:
-                # should usually be caught by propagate(), but handle defensively
-                continue
-
-            # choose branch literal
-            branch_lit = self.choose_branch_literal()
+            # choose branch literal, unless every clause already has a
+            # true literal
+            branch_lit = None
+            if self.n_unsat_clauses:
+                branch_lit = self.choose_branch_literal()
             if branch_lit is None:
-                # no unassigned vars left; treat as SAT
+                # all clauses satisfied or no unassigned vars left: SAT
                 self.solve_time = time.perf_counter() - start
-                return {v: bool(self.assignment[v]) for v in range(1, self.num_vars + 1)}
+                return self._model()
 
             self.split_count += 1
             mark = len(self.trail)
@@ -347,3 +609,23 @@ class DPLL:
             if not self.assign_literal(branch_lit):
                 # immediate conflict -> loop will backtrack on next propagate()
                 continue
+
+
+# ---------- portfolio workers ----------
+
+_cancel = None
+
+
+def _portfolio_init(cancel) -> None:
+    """Pool initializer: keep the shared stop event for this process."""
+    global _cancel
+    _cancel = cancel
+
+
+def _portfolio_worker(clauses, num_vars, seed):
+    """
+    Solve one portfolio variant; returns (seed, model, split_count, solve_time).
+    """
+    solver = DPLL(clauses=clauses, num_vars=num_vars)
+    model = solver.solve(seed=seed, stop=_cancel)
+    return seed, model, solver.split_count, solver.solve_time
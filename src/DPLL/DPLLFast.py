@@ -1,9 +1,15 @@
+import multiprocessing as mp
+import os
 import time
 from array import array
-from collections import defaultdict
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from functools import partial
 import random
 
-from src.dpll_cy.core import propagate_watched
+import numpy as np
+
+from src.cnf_flat import split_lits
+from src.dpll_cy.core import propagate_watched, search_static
 
 
 class DPLLFast:
@@ -12,96 +18,169 @@ class DPLLFast:
     Iterative DFS (no recursion).
     """
 
-    def __init__(self, lits: array, offsets: array, num_vars: int):
-        self.lits = lits
-        self.offsets = offsets
+    def __init__(self, lits: np.ndarray, offsets: np.ndarray, num_vars: int):
         self.num_vars = num_vars
-        self.num_clauses = len(offsets) - 1
+        self.num_clauses = -1
 
-        # assignment: 0 unassigned, +1 true, -1 false
+        # per-solve buffers, allocated once: the assignment and a zero
+        # template to clear it in place, the watch heads and their empty
+        # template, and the DFS frames (3 ints each, native static search) /
+        # tuples (Python search)
         self.assign = array('b', [0]) * (self.num_vars + 1)
+        self._zero_assign = array('b', [0]) * (self.num_vars + 1)
+        self.head = array('i', [-1]) * (2 * self.num_vars + 1)
+        self._empty_head = array('i', [-1]) * (2 * self.num_vars + 1)
         self.trail = array('i')  # stack of assigned vars
-        self.trail_start = 0
-
-        # watched literal positions: absolute indices into self.lits
-        self.wpos1 = array('i', [0]) * self.num_clauses
-        self.wpos2 = array('i', [0]) * self.num_clauses
+        self._stack = array('i', [0]) * (3 * (self.num_vars + 1))
+        self._frames = []
 
         # watchlists as linked lists over nodes (lazy)
-        # literal index in [0..2n] via lit + n
-        self.head = array('i', [-1]) * (2 * self.num_vars + 1)
         self.node_clause = array('i')
         self.node_next = array('i')
         self.node_lit = array('i')
+        self.node_block = array('i')  # blocker literal per node
+
+        self.load(lits, offsets)
+
+    def load(self, lits: np.ndarray, offsets: np.ndarray | None = None):
+        """
+        Swap in another instance over the same num_vars variables, keeping
+        the per-variable buffers (and the per-clause ones when the clause
+        count is unchanged), then reset(). offsets=None keeps the current
+        clause layout, e.g. for the instances of one random_3sat_flat_batch.
+        """
+        # the Cython kernel takes C-contiguous int32 buffers; cnf_flat
+        # already produces those, so this is a no-op copy-wise for them
+        self.lits = np.ascontiguousarray(lits, dtype=np.int32)
+        if offsets is not None:
+            offsets = np.ascontiguousarray(offsets, dtype=np.int32)
+            if self.num_clauses != len(offsets) - 1:
+                self.num_clauses = len(offsets) - 1
+                # watched literal positions: absolute indices into self.lits
+                self.wpos1 = array('i', [0]) * self.num_clauses
+                self.wpos2 = array('i', [0]) * self.num_clauses
+            old = getattr(self, "offsets", None)
+            # random_3sat_flat hands out a fresh (but equal) offsets array
+            # per instance: compare by value before rebuilding
+            if old is None or not np.array_equal(offsets, old):
+                self.offsets = offsets
+                self._flat_clause = np.repeat(np.arange(self.num_clauses),
+                                              np.diff(self.offsets))
+
+        self.reset()
+
+        # static literal count heuristic (cheap): one bincount over the flat
+        # literals; counts[lit + num_vars] is the count of lit
+        lits_np = self.lits
+        counts = np.bincount(lits_np + self.num_vars, minlength=2 * self.num_vars + 1)
+        # literals that occur, in first-occurrence order (the static
+        # heuristic's tie-break), with their counts
+        uniq, first = np.unique(lits_np, return_index=True)
+        self._all_lits_np = uniq[np.argsort(first)]
+        self._all_vars_np = np.abs(self._all_lits_np)
+        self._all_counts_np = counts[self._all_lits_np + self.num_vars]
+        # the static heuristic's preference order (stable, so ties keep
+        # first-occurrence order), for the native search loop
+        self._static_order = np.ascontiguousarray(
+            self._all_lits_np[np.argsort(-self._all_counts_np, kind="stable")])
+
+        # flat per-literal tables for the vectorized 2clause heuristic:
+        # variable, sign and static count of each literal (owning clause is
+        # _flat_clause, which only depends on offsets)
+        self._lits_np = lits_np
+        self._flat_vars, self._flat_signs = split_lits(lits_np)
+        self._flat_counts = counts[lits_np + self.num_vars]
+
+    def reset(self):
+        """
+        Rewind to the freshly-constructed state so the same instance can be
+        solved again (e.g. with another branch_mode) without rebuilding it.
+        Drops the stale watch nodes accumulated by the previous solve.
+        """
+        # assignment: 0 unassigned, +1 true, -1 false; cleared in place
+        self.assign[:] = self._zero_assign
+        del self.trail[:]
+        self.trail_start = 0
+
+        # watchlists as linked lists over nodes (lazy)
+        # literal index in [0..2n] via lit + n
+        self.head[:] = self._empty_head
+        del self.node_clause[:]
+        del self.node_next[:]
+        del self.node_lit[:]
+        del self.node_block[:]
 
         self._init_watches()
 
         # stats
         self.split_count = 0
         self.solve_time = 0.0
-
-        # static literal count heuristic (cheap)
-        self.lit_count = defaultdict(int)
-        for L in self.lits:
-            self.lit_count[L] += 1
-        self._all_lits = list(self.lit_count.keys())
-
-    def _lit_index(self, lit: int) -> int:
-        return lit + self.num_vars
-
-    def _add_watch_node(self, lit: int, ci: int):
-        node_id = len(self.node_clause)
-        self.node_clause.append(ci)
-        self.node_lit.append(lit)
-        self.node_next.append(self.head[self._lit_index(lit)])
-        self.head[self._lit_index(lit)] = node_id
+        self.timed_out = False
 
     def _init_watches(self):
-        for ci in range(self.num_clauses):
-            s = self.offsets[ci]
-            e = self.offsets[ci + 1]
-            if e - s <= 0:
-                self.wpos1[ci] = s
-                self.wpos2[ci] = s
-                continue
-            if e - s == 1:
-                self.wpos1[ci] = s
-                self.wpos2[ci] = s
-                lit = self.lits[s]
-                self._add_watch_node(lit, ci)
-                self._add_watch_node(lit, ci)
-            else:
-                self.wpos1[ci] = s
-                self.wpos2[ci] = s + 1
-                self._add_watch_node(self.lits[s], ci)
-                self._add_watch_node(self.lits[s + 1], ci)
-
-    def _choose_branch_lit(self, mode: str, rng: random.Random) -> int | None:
+        """
+        Watch the first two literals of every clause (a unit clause watches
+        its literal twice), as two nodes per clause pushed in clause order
+        onto the watchlist of their literal. Built with numpy: a node's next
+        is the previous node on the same literal, head the last one.
+        """
+        n = self.num_vars
+        starts = self.offsets[:-1]
+        lengths = np.diff(self.offsets)
+        second = starts + (lengths >= 2)
+        np.frombuffer(self.wpos1, dtype=np.int32)[:] = starts
+        np.frombuffer(self.wpos2, dtype=np.int32)[:] = second
+
+        watched = np.flatnonzero(lengths > 0)
+        lit1 = self.lits[starts[watched]]
+        lit2 = self.lits[second[watched]]
+        node_lit = np.column_stack((lit1, lit2)).ravel()
+        node_block = np.column_stack((lit2, lit1)).ravel()
+        if node_lit.size == 0:
+            return  # nothing to watch (no clauses, or only empty ones)
+
+        order = np.argsort(node_lit, kind="stable").astype(np.int32)
+        key = node_lit[order]
+        same = key[1:] == key[:-1]
+        node_next = np.full(len(node_lit), -1, dtype=np.int32)
+        node_next[order[1:][same]] = order[:-1][same]
+        last = np.append(~same, True)
+        np.frombuffer(self.head, dtype=np.int32)[key[last] + n] = order[last]
+
+        self.node_clause.frombytes(np.repeat(watched.astype(np.int32), 2).tobytes())
+        self.node_lit.frombytes(node_lit.tobytes())
+        self.node_block.frombytes(node_block.tobytes())
+        self.node_next.frombytes(node_next.tobytes())
+
+    def _branch_chooser(self, mode: str, rng: random.Random):
+        """
+        Resolve branch_mode once per solve to a zero-arg chooser, so the
+        search loop does no string comparisons per decision.
+        """
         if mode == "random":
-            return self._choose_branch_lit_random(rng)
+            return partial(self._choose_branch_lit_random, rng)
         if mode == "2clause":
-            lit = self._choose_branch_lit_2clause()
-            if lit is not None:
-                return lit
-            # fallback if no 2-clauses exist right now
-            return self._choose_branch_lit_static()
+            def choose_2clause() -> int | None:
+                lit = self._choose_branch_lit_2clause()
+                if lit is not None:
+                    return lit
+                # fallback if no 2-clauses exist right now
+                return self._choose_branch_lit_static()
+            return choose_2clause
         # default: your current heuristic
-        return self._choose_branch_lit_static()
+        return self._choose_branch_lit_static
 
     def _choose_branch_lit_static(self) -> int | None:
-        """Your existing cheap static literal-count heuristic."""
-        best_lit = None
-        best = -1
-        a = self.assign
-        for lit in self._all_lits:
-            v = lit if lit > 0 else -lit
-            if a[v] != 0:
-                continue
-            c = self.lit_count[lit]
-            if c > best:
-                best = c
-                best_lit = lit
-        return best_lit
+        """
+        Your existing cheap static literal-count heuristic, as a masked
+        argmax over all literals (first maximum wins, as in a linear scan).
+        """
+        a = np.frombuffer(self.assign, dtype=np.int8)
+        free = a[self._all_vars_np] == 0
+        if not free.any():
+            return None
+        k = np.where(free, self._all_counts_np, -1).argmax()
+        return int(self._all_lits_np[k])
 
     def _choose_branch_lit_random(self, rng: random.Random) -> int | None:
         """Pick an unassigned variable uniformly at random, then random polarity."""
@@ -120,50 +199,26 @@ class DPLLFast:
         """
         2-clause heuristic:
         Find any clause that is not yet satisfied and has exactly 2 unassigned literals.
-        Choose a literal from those (tie-break using your lit_count).
-        """
-        a = self.assign
-        best_lit = None
-        best_score = -1
-
-        # scan all clauses in flat representation
-        for ci in range(self.num_clauses):
-            s = self.offsets[ci]
-            e = self.offsets[ci + 1]
-
-            # check if clause is already satisfied, and count unassigned lits
-            unassigned = []
-            satisfied = False
-
-            for k in range(s, e):
-                lit = self.lits[k]
-                v = lit if lit > 0 else -lit
-                av = a[v]
-
-                if av == 0:
-                    unassigned.append(lit)
-                    # small early stop: if >2, not a 2-clause candidate
-                    if len(unassigned) > 2:
-                        break
-                else:
-                    # is lit true?
-                    if (lit > 0 and av == 1) or (lit < 0 and av == -1):
-                        satisfied = True
-                        break
+        Choose a literal from those (tie-break using its static literal count).
 
-            if satisfied:
-                continue
-            if len(unassigned) != 2:
-                continue
-
-            # choose between the two literals using static literal count as a proxy score
-            for lit in unassigned:
-                score = self.lit_count.get(lit, 0)
-                if score > best_score:
-                    best_score = score
-                    best_lit = lit
-
-        return best_lit
+        Vectorized over the flat literals: per-literal values are gathered
+        once, reduced per clause with bincount, and the best candidate is
+        the first maximum in clause order, as in a clause-by-clause scan.
+        """
+        a = np.frombuffer(self.assign, dtype=np.int8)
+        val = a[self._flat_vars] * self._flat_signs   # +1 true, 0 free, -1 false
+        free = val == 0
+        m = self.num_clauses
+        n_true = np.bincount(self._flat_clause, weights=val > 0, minlength=m)
+        n_free = np.bincount(self._flat_clause, weights=free, minlength=m)
+        cand = (n_true == 0) & (n_free == 2)
+
+        idx = np.flatnonzero(cand[self._flat_clause] & free)
+        if idx.size == 0:
+            return None
+        # choose between the candidate literals using static literal count as a proxy score
+        k = idx[self._flat_counts[idx].argmax()]
+        return int(self._lits_np[k])
 
     def _assign_lit(self, lit: int) -> bool:
         v = lit if lit > 0 else -lit
@@ -182,7 +237,8 @@ class DPLLFast:
         if self.trail_start > mark:
             self.trail_start = mark
 
-    def solve(self, time_limit: float | None = None, branch_mode: str = "static", seed: int | None = None):
+    def solve(self, time_limit: float | None = None, branch_mode: str = "static", seed: int | None = None,
+              stop=None):
 
         """
         Solve with an optional time limit.
@@ -190,32 +246,73 @@ class DPLLFast:
         Args:
             time_limit (float | None): Maximum wall-clock seconds to spend on this instance.
                 If None, no time limit is enforced.
+            stop: optional event (anything with is_set()), polled with the time
+                limit; the search gives up once it is set.
 
         Returns:
             dict[int, bool] | None:
                 - model if SAT
-                - None if UNSAT or TIMEOUT (you can track timeout separately if desired)
+                - None if UNSAT or TIMEOUT (self.timed_out tells them apart)
         """
         self.split_count = 0
         self.solve_time = 0.0
-        self.assign = array('b', [0]) * (self.num_vars + 1)
-        self.trail = array('i')
+        self.timed_out = False
+        # clear in place instead of reallocating
+        self.assign[:] = self._zero_assign
+        del self.trail[:]
         self.trail_start = 0
         rng = random.Random(seed)
+        choose_branch_lit = self._branch_chooser(branch_mode, rng)
         start = time.perf_counter()
         next_check = 1024  # check time every ~1024 loop iterations (cheap)
 
-        stack = []  # (branch_lit, trail_mark, flipped)
+        if branch_mode == "static":
+            # the static heuristic needs no Python callback: run the whole
+            # search in the Cython kernel, 1024 steps per burst
+            stack = self._stack
+            depth = 0
+            while True:
+                status, self.trail_start, depth, splits = search_static(
+                    self.num_vars,
+                    self.lits, self.offsets,
+                    self.wpos1, self.wpos2,
+                    self.head,
+                    self.node_clause, self.node_next, self.node_lit, self.node_block,
+                    self.assign,
+                    self.trail,
+                    self.trail_start,
+                    stack, depth,
+                    self._static_order,
+                    next_check
+                )
+                self.split_count += splits
+                if status != -1:
+                    break
+                if ((time_limit is not None and (time.perf_counter() - start) > time_limit)
+                        or (stop is not None and stop.is_set())):
+                    self.solve_time = time.perf_counter() - start
+                    self.timed_out = True
+                    return None  # TIMEOUT
+
+            self.solve_time = time.perf_counter() - start
+            if status == 0:
+                return None
+            return {v: (self.assign[v] == 1) for v in range(1, self.num_vars + 1)}
+
+        stack = self._frames  # (branch_lit, trail_mark, flipped)
+        stack.clear()
         steps = 0
 
         while True:
             steps += 1
 
-            # --- time limit check (amortized) ---
-            if time_limit is not None and steps >= next_check:
+            # --- time limit / stop check (amortized) ---
+            if steps >= next_check:
                 next_check += 1024
-                if (time.perf_counter() - start) > time_limit:
+                if ((time_limit is not None and (time.perf_counter() - start) > time_limit)
+                        or (stop is not None and stop.is_set())):
                     self.solve_time = time.perf_counter() - start
+                    self.timed_out = True
                     return None  # TIMEOUT
 
             ok, new_ts = propagate_watched(
@@ -223,7 +320,7 @@ class DPLLFast:
                 self.lits, self.offsets,
                 self.wpos1, self.wpos2,
                 self.head,
-                self.node_clause, self.node_next, self.node_lit,
+                self.node_clause, self.node_next, self.node_lit, self.node_block,
                 self.assign,
                 self.trail,
                 self.trail_start
@@ -264,7 +361,7 @@ class DPLLFast:
                 return {v: (self.assign[v] == 1) for v in range(1, self.num_vars + 1)}
 
             # choose branch
-            branch_lit = self._choose_branch_lit(branch_mode, rng)
+            branch_lit = choose_branch_lit()
             if branch_lit is None:
                 # No branchable literal -> treat as SAT
                 self.solve_time = time.perf_counter() - start
@@ -276,3 +373,77 @@ class DPLLFast:
 
             # first branch
             self._assign_lit(branch_lit)
+
+    def solve_portfolio(self, time_limit: float | None = None, n_workers: int | None = None,
+                        configs=None):
+        """
+        Race several (branch_mode, seed) configurations of this instance in
+        separate processes and keep the first one that decides it.
+
+        Args:
+            time_limit: per-configuration limit, as in solve().
+            n_workers: processes (default os.cpu_count()).
+            configs: list of (branch_mode, seed); default static and 2clause
+                plus seeded random runs, n_workers in total.
+
+        Returns:
+            dict[int, bool] | None, like solve(); the winning config is kept
+            in self.portfolio_winner (None if every configuration timed out).
+        """
+        n_workers = n_workers or os.cpu_count() or 1
+        if configs is None:
+            configs = [("static", None), ("2clause", None)]
+            configs += [("random", k) for k in range(1, n_workers - 1)]
+            configs = configs[:n_workers]
+        cancel = mp.Event()
+
+        winner = None
+        start = time.perf_counter()
+        with ProcessPoolExecutor(max_workers=n_workers, initializer=_portfolio_init,
+                                 initargs=(cancel,)) as pool:
+            pending = {pool.submit(_portfolio_worker, self.lits, self.offsets, self.num_vars,
+                                   mode, seed, time_limit)
+                       for mode, seed in configs}
+            while pending and winner is None:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for f in done:
+                    result = f.result()
+                    if not result[3]:  # decided, not timed out
+                        winner = result
+                        break
+            cancel.set()
+
+        if winner is None:
+            self.portfolio_winner = None
+            self.timed_out = True
+            self.split_count = 0
+            self.solve_time = time.perf_counter() - start
+            return None
+
+        mode, seed, model, _, self.split_count, self.solve_time = winner
+        self.portfolio_winner = (mode, seed)
+        self.timed_out = False
+        return model
+
+
+# ---------- portfolio workers ----------
+
+_cancel = None
+
+
+def _portfolio_init(cancel) -> None:
+    """Pool initializer: keep the shared stop event for this process."""
+    global _cancel
+    _cancel = cancel
+
+
+def _portfolio_worker(lits, offsets, num_vars, mode, seed, time_limit):
+    """
+    Solve one portfolio configuration.
+
+    Returns:
+      (mode, seed, model, timed_out, split_count, solve_time)
+    """
+    solver = DPLLFast(lits, offsets, num_vars=num_vars)
+    model = solver.solve(time_limit=time_limit, branch_mode=mode, seed=seed, stop=_cancel)
+    return mode, seed, model, solver.timed_out, solver.split_count, solver.solve_time
@@ -1,50 +1,83 @@
-import random
-from array import array
+from itertools import chain
 from typing import Iterable, List, Tuple
 
+import numpy as np
 
-def flatten_clauses(clauses: List[List[int]]) -> Tuple[array, array]:
+# bump whenever random_3sat_flat's output for a given seed changes, so
+# instances cached on disk by an older generator are not reused
+GENERATOR_VERSION = 2
+
+
+def flatten_clauses(clauses: List[List[int]]) -> Tuple[np.ndarray, np.ndarray]:
     """
     Convert list-of-clauses into flat storage.
 
     Returns:
-        lits: array('i') of all literals concatenated
-        offsets: array('I') where clause i is lits[offsets[i]:offsets[i+1]]
+        lits: int32 ndarray of all literals concatenated
+        offsets: int32 ndarray where clause i is lits[offsets[i]:offsets[i+1]]
+
+    Both are C-contiguous int32, the layout the Cython kernel takes
+    zero-copy.
     """
-    lits = array('i')
-    offsets = array('I', [0])
+    offsets = np.zeros(len(clauses) + 1, dtype=np.int32)
+    np.cumsum(np.fromiter(map(len, clauses), dtype=np.int32, count=len(clauses)),
+              out=offsets[1:])
+    lits = np.fromiter(chain.from_iterable(clauses), dtype=np.int32, count=int(offsets[-1]))
+    return lits, offsets
 
-    for c in clauses:
-        lits.extend(c)
-        offsets.append(len(lits))
 
-    return lits, offsets
+def split_lits(lits: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Split flat literals into parallel variable / sign arrays.
+
+    Returns:
+        vars: int32 ndarray, vars[k] = abs(lits[k])
+        signs: int8 ndarray, signs[k] = +1 / -1
+
+    so assign[vars] * signs is each literal's value (+1 true, 0 free,
+    -1 false) in one gather, with no per-literal abs/sign.
+    """
+    lits = np.asarray(lits, dtype=np.int32)
+    return np.abs(lits), np.where(lits > 0, 1, -1).astype(np.int8)
 
-def random_3sat_flat(L: int, N: int, seed: int | None = None) -> Tuple[array, array]:
+def random_3sat_flat(L: int, N: int, seed: int | None = None) -> Tuple[np.ndarray, np.ndarray]:
     """
     Generate random 3-SAT in flat form.
 
     Returns:
-        lits: array('i') length 3*L
-        offsets: array('I') length L+1, offsets[i] = 3*i
+        lits: int32 ndarray length 3*L
+        offsets: int32 ndarray length L+1, offsets[i] = 3*i
+    """
+    lits, offsets = random_3sat_flat_batch(L, N, 1, seed)
+    return lits[0], offsets
+
+
+def random_3sat_flat_batch(L: int, N: int, num_instances: int,
+                           seed: int | None = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Generate `num_instances` random 3-SAT instances in one vectorized draw.
+
+    Returns:
+        lits: int32 ndarray (num_instances, 3*L), row t is instance t
+        offsets: int32 ndarray length L+1, offsets[i] = 3*i, shared by all rows
+
+    With num_instances=1 this is exactly random_3sat_flat(L, N, seed).
     """
     if N < 3:
         raise ValueError("Need N>=3")
     if L <= 0:
         raise ValueError("Need L>0")
 
-    rng = random.Random(seed)
-    lits = array('i')
-    offsets = array('I', [0])
-
-    for _ in range(L):
-        v1, v2, v3 = rng.sample(range(1, N + 1), 3)
-        c = [
-            -v1 if rng.random() < 0.5 else v1,
-            -v2 if rng.random() < 0.5 else v2,
-            -v3 if rng.random() < 0.5 else v3,
-        ]
-        lits.extend(c)
-        offsets.append(len(lits))
-
-    return lits, offsets
\ No newline at end of file
+    rng = np.random.default_rng(seed)
+    n = num_instances * L
+
+    # draw all clauses at once, redrawing the (rare) rows that repeat a var
+    vars_ = rng.integers(1, N + 1, size=(n, 3), dtype=np.int32)
+    bad = (vars_[:, 0] == vars_[:, 1]) | (vars_[:, 0] == vars_[:, 2]) | (vars_[:, 1] == vars_[:, 2])
+    while bad.any():
+        vars_[bad] = rng.integers(1, N + 1, size=(int(bad.sum()), 3), dtype=np.int32)
+        bad = (vars_[:, 0] == vars_[:, 1]) | (vars_[:, 0] == vars_[:, 2]) | (vars_[:, 1] == vars_[:, 2])
+
+    signs = np.where(rng.random((n, 3)) < 0.5, -1, 1).astype(np.int32)
+    lits = (vars_ * signs).reshape(num_instances, 3 * L)
+    return lits, np.arange(0, 3 * L + 1, 3, dtype=np.int32)
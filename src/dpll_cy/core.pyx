@@ -2,6 +2,14 @@
 
 from array import array
 cimport cython
+from cpython cimport array as carray
+
+cdef inline int push_int(carray.array a, int x) except -1:
+    # append to an array('i') without a Python method call
+    cdef Py_ssize_t n = len(a)
+    carray.resize_smart(a, n + 1)
+    a.data.as_ints[n] = x
+    return 0
 
 @cython.cfunc
 @cython.inline
@@ -12,7 +20,7 @@ cdef int lit_index(int lit, int nvars) nogil:
 
 @cython.cfunc
 @cython.inline
-cdef bint lit_is_false(int lit, signed char[:] assign) nogil:
+cdef bint lit_is_false(int lit, signed char[::1] assign) nogil:
     cdef int v = lit if lit > 0 else -lit
     cdef signed char a = assign[v]
     if a == 0:
@@ -24,7 +32,7 @@ cdef bint lit_is_false(int lit, signed char[:] assign) nogil:
 
 @cython.cfunc
 @cython.inline
-cdef bint lit_is_true(int lit, signed char[:] assign) nogil:
+cdef bint lit_is_true(int lit, signed char[::1] assign) nogil:
     cdef int v = lit if lit > 0 else -lit
     cdef signed char a = assign[v]
     if a == 0:
@@ -49,19 +57,20 @@ cdef signed char lit_value(int lit) nogil:
 
 def propagate_watched(
     int nvars,
-    int[:] lits,           # flat literals
-    unsigned int[:] off,   # offsets length m+1
+    const int[::1] lits,   # flat literals (int32, C-contiguous)
+    const int[::1] off,    # offsets length m+1 (int32)
 
-    int[:] wpos1,          # watched positions (absolute indices into lits)
-    int[:] wpos2,
+    int[::1] wpos1,        # watched positions (absolute indices into lits)
+    int[::1] wpos2,
 
-    int[:] head,           # head per literal index (size 2*nvars+1), -1 if empty
+    int[::1] head,         # head per literal index (size 2*nvars+1), -1 if empty
 
     object node_clause,    # Python array('i'): node -> clause id
     object node_next,      # Python array('i'): node -> next node
     object node_lit,       # Python array('i'): node -> watched literal value
+    object node_block,     # Python array('i'): node -> blocker (other watch when linked)
 
-    signed char[:] assign, # 0 unassigned, +1 true, -1 false
+    signed char[::1] assign, # 0 unassigned, +1 true, -1 false
     object trail,          # Python array('i'): stack of assigned vars (var ids)
     int trail_start        # start index in trail to propagate from
 ):
@@ -71,18 +80,33 @@ def propagate_watched(
     Returns:
       (ok: bool, new_trail_start: int)
     """
+    # every var is enqueued at most once per call (already-assigned or newly
+    # forced), so nvars bounds the queue length
+    cdef int[::1] q = array('i', [0]) * (nvars + 8)
+    cdef int ok = _propagate(nvars, lits, off, wpos1, wpos2, head,
+                             node_clause, node_next, node_lit, node_block,
+                             assign, trail, trail_start, q)
+    return (ok == 1, len(trail))
+
+
+cdef int _propagate(
+    int nvars, const int[::1] lits, const int[::1] off,
+    int[::1] wpos1, int[::1] wpos2, int[::1] head,
+    carray.array node_clause, carray.array node_next,
+    carray.array node_lit, carray.array node_block,
+    signed char[::1] assign, carray.array trail, int trail_start,
+    int[::1] q               # scratch queue, at least nvars + 8 long
+) except -1:
+    # body of propagate_watched: 1 if no conflict, 0 on conflict.
+    # The node/trail arrays are read through their C buffers (.data) and
+    # grown with push_int, so the hot loop makes no Python calls.
     cdef int qhead = 0
     cdef int qtail = 0
     cdef int tlen = len(trail)
-    cdef int qcap = (tlen - trail_start) + 8
-
-    # queue as Python array, plus fast memoryview over it
-    cdef object py_queue = array('i', [0]) * qcap
-    cdef int[:] q = py_queue
 
-    cdef int ti, v, false_lit, idx
+    cdef int ti, v, false_lit, idx, blocker
     cdef int node, ci
-    cdef unsigned int s, e
+    cdef int s, e
     cdef int p1, p2, lit1, lit2, other_pos, other_lit, false_pos
     cdef int k, L, newpos
     cdef bint moved
@@ -91,7 +115,7 @@ def propagate_watched(
 
     # enqueue false literals from new assignments
     for ti in range(trail_start, tlen):
-        v = trail[ti]
+        v = trail.data.as_ints[ti]
         if assign[v] == 1:
             false_lit = -v
         else:
@@ -107,11 +131,18 @@ def propagate_watched(
         idx = lit_index(false_lit, nvars)
         node = head[idx]
         while node != -1:
-            ci = node_clause[node]
+            ci = node_clause.data.as_ints[node]
 
             # skip stale watch nodes
-            if node_lit[node] != false_lit:
-                node = node_next[node]
+            if node_lit.data.as_ints[node] != false_lit:
+                node = node_next.data.as_ints[node]
+                continue
+
+            # blocker already true: clause satisfied, skip it without
+            # touching wpos/lits
+            blocker = node_block.data.as_ints[node]
+            if lit_is_true(blocker, assign):
+                node = node_next.data.as_ints[node]
                 continue
 
             # fetch watched positions and literals
@@ -131,18 +162,21 @@ def propagate_watched(
                 other_lit = lit1
             else:
                 # stale node
-                node = node_next[node]
+                node = node_next.data.as_ints[node]
                 continue
 
             # If other watch is already true, clause satisfied
             if lit_is_true(other_lit, assign):
-                node = node_next[node]
+                node = node_next.data.as_ints[node]
                 continue
 
             # Try to find replacement literal not false
+            # (binary clauses have none: the other watch is the only candidate)
             s = off[ci]
             e = off[ci + 1]
             moved = False
+            if e - s <= 2:
+                e = s
             for k in range(s, e):
                 if k == other_pos or k == false_pos:
                     continue
@@ -155,9 +189,10 @@ def propagate_watched(
                         wpos2[ci] = newpos
 
                     # append NEW watch node for L (lazy)
-                    node_clause.append(ci)
-                    node_lit.append(L)
-                    node_next.append(head[lit_index(L, nvars)])
+                    push_int(node_clause, ci)
+                    push_int(node_lit, L)
+                    push_int(node_block, other_lit)
+                    push_int(node_next, head[lit_index(L, nvars)])
 
                     node_id = len(node_clause) - 1
                     head[lit_index(L, nvars)] = node_id
@@ -166,19 +201,19 @@ def propagate_watched(
                     break
 
             if moved:
-                node = node_next[node]
+                node = node_next.data.as_ints[node]
                 continue
 
             # no replacement => unit or conflict based on other_lit
             if lit_is_false(other_lit, assign):
-                return (False, len(trail))  # conflict
+                return 0  # conflict
 
             # If other_lit unassigned, force it
             v = lit_var(other_lit)
             if assign[v] == 0:
                 need = lit_value(other_lit)
                 assign[v] = need
-                trail.append(v)
+                push_int(trail, v)
 
                 # enqueue its false literal
                 if need == 1:
@@ -187,6 +222,90 @@ def propagate_watched(
                     q[qtail] = v
                 qtail += 1
 
-            node = node_next[node]
+            node = node_next.data.as_ints[node]
 
-    return (True, len(trail))
\ No newline at end of file
+    return 1
+
+
+def search_static(
+    int nvars, const int[::1] lits, const int[::1] off,
+    int[::1] wpos1, int[::1] wpos2, int[::1] head,
+    carray.array node_clause, carray.array node_next,
+    carray.array node_lit, carray.array node_block,
+    signed char[::1] assign, carray.array trail, int trail_start,
+    int[::1] stack,          # DFS frames (branch_lit, trail_mark, flipped), 3 ints each
+    int depth,             # number of frames in use
+    const int[::1] lit_order,      # literals by decreasing static count (static heuristic)
+    int max_steps          # loop iterations before handing back to Python
+):
+    """
+    Whole DPLL search loop (propagate / backtrack / static branching) in C,
+    run for at most max_steps iterations so the caller can check its time
+    limit between bursts. stack/depth/trail carry the state across calls.
+
+    Returns:
+      (status, new_trail_start, depth, splits)
+      status: 1 SAT, 0 UNSAT, -1 step budget used up
+    """
+    cdef int steps = 0
+    cdef int splits = 0
+    cdef int ok, f, lit, v, mark, k
+    cdef int n_order = lit_order.shape[0]
+    cdef int[::1] q = array('i', [0]) * (nvars + 8)
+    cdef Py_ssize_t t
+
+    while steps < max_steps:
+        steps += 1
+
+        ok = _propagate(nvars, lits, off, wpos1, wpos2, head,
+                        node_clause, node_next, node_lit, node_block,
+                        assign, trail, trail_start, q)
+        trail_start = len(trail)
+
+        if ok == 0:
+            # backtrack to the most recent unflipped decision
+            while depth > 0:
+                depth -= 1
+                f = 3 * depth
+                lit = stack[f]
+                mark = stack[f + 1]
+                for t in range(mark, len(trail)):
+                    assign[trail.data.as_ints[t]] = 0
+                carray.resize_smart(trail, mark)
+                if trail_start > mark:
+                    trail_start = mark
+
+                if stack[f + 2] == 0:
+                    # try opposite branch
+                    stack[f + 2] = 1
+                    depth += 1
+                    v = lit_var(lit)
+                    assign[v] = -lit_value(lit)
+                    push_int(trail, v)
+                    break
+            else:
+                return (0, trail_start, depth, splits)
+            continue
+
+        # static heuristic: first unassigned literal in count order
+        lit = 0
+        for k in range(n_order):
+            if assign[lit_var(lit_order[k])] == 0:
+                lit = lit_order[k]
+                break
+        if lit == 0:
+            # no branchable literal left: SAT
+            return (1, trail_start, depth, splits)
+
+        splits += 1
+        f = 3 * depth
+        stack[f] = lit
+        stack[f + 1] = len(trail)
+        stack[f + 2] = 0
+        depth += 1
+
+        v = lit_var(lit)
+        assign[v] = lit_value(lit)
+        push_int(trail, v)
+
+    return (-1, trail_start, depth, splits)
@@ -1,3 +1,6 @@
+import io
+
+
 def buildMap(all):
     res = {}
     idx = 1 
@@ -11,7 +14,7 @@ def buildMap(all):
 
 def writePair(f, c1, c2):
     """Write clause: ¬c1 ∨ c2"""
-    f.write(f"-{c1} {c2} 0\n")
+    f.write(f"{-c1} {c2} 0\n")
 
 
 def writeSolo(f, c1):
@@ -21,32 +24,34 @@ def writeSolo(f, c1):
 
 def writeTriplet(f, c1, c2, c3):
     """Write clause: ¬c1 ∨ c2 ∨ c3"""
-    f.write(f"-{c1} {c2} {c3} 0\n")
+    f.write(f"{-c1} {c2} {c3} 0\n")
 
 
 def writeNegSolo(f, c1):
     """Write clause: ¬c1"""
-    f.write(f"-{c1} 0\n")
+    f.write(f"{-c1} 0\n")
+
+
+def houseVars(encoding, name):
+    """Variable ids of name_1..name_5, indexed by house - 1."""
+    return [encoding[f"{name}_{house}"] for house in range(1, 6)]
 
 
 def writeNextTo(f, encoding, sym1, sym2):
     """
     Encode: sym1@i → sym2 at a neighboring house.
     """
+    a, b = houseVars(encoding, sym1), houseVars(encoding, sym2)
+
     # House 1: sym1_1 → sym2_2
-    writePair(f, encoding[f"{sym1}_1"], encoding[f"{sym2}_2"])
+    writePair(f, a[0], b[1])
 
     # House 5: sym1_5 → sym2_4
-    writePair(f, encoding[f"{sym1}_5"], encoding[f"{sym2}_4"])
+    writePair(f, a[4], b[3])
 
     # Houses 2..4: sym1_i → (sym2_{i-1} ∨ sym2_{i+1})
-    for i in range(2, 5):
-        writeTriplet(
-            f,
-            encoding[f"{sym1}_{i}"],
-            encoding[f"{sym2}_{i-1}"],
-            encoding[f"{sym2}_{i+1}"],
-        )
+    for i in range(1, 4):
+        writeTriplet(f, a[i], b[i - 1], b[i + 1])
 
 def writeHints(f, encoding):
 
@@ -54,21 +59,22 @@ def writeHints(f, encoding):
     writeSolo(f, encoding["norwegian_1"])
     writeSolo(f, encoding["milk_3"])
 
-    # same-house hints
-    for i in range(1, 6):
-        writePair(f, encoding[f"brit_{i}"],        encoding[f"red_{i}"])
-        writePair(f, encoding[f"swede_{i}"],       encoding[f"dog_{i}"])
-        writePair(f, encoding[f"dane_{i}"],        encoding[f"tea_{i}"])
-        writePair(f, encoding[f"green_{i}"],       encoding[f"coffee_{i}"])
-        writePair(f, encoding[f"pallmall_{i}"],    encoding[f"birds_{i}"])
-        writePair(f, encoding[f"yellow_{i}"],      encoding[f"dunhill_{i}"])
-        writePair(f, encoding[f"bluemasters_{i}"], encoding[f"beer_{i}"])
-        writePair(f, encoding[f"german_{i}"],      encoding[f"prince_{i}"])
+    # same-house hints, each name resolved to its 5 house vars once
+    pairs = [
+        ("brit", "red"), ("swede", "dog"), ("dane", "tea"), ("green", "coffee"),
+        ("pallmall", "birds"), ("yellow", "dunhill"), ("bluemasters", "beer"),
+        ("german", "prince"),
+    ]
+    pairs = [(houseVars(encoding, x), houseVars(encoding, y)) for x, y in pairs]
+    for i in range(5):
+        for x, y in pairs:
+            writePair(f, x[i], y[i])
 
     # positional: green immediately left of white
-    for i in range(1, 5):
-        writePair(f, encoding[f"green_{i}"], encoding[f"white_{i+1}"])
-    writeNegSolo(f, encoding["green_5"])
+    green, white = houseVars(encoding, "green"), houseVars(encoding, "white")
+    for i in range(4):
+        writePair(f, green[i], white[i + 1])
+    writeNegSolo(f, green[4])
 
     # lives-next-to hints
     writeNextTo(f, encoding, "blends",    "cats")
@@ -77,26 +83,28 @@ def writeHints(f, encoding):
     writeNextTo(f, encoding, "blends",    "water")
 
 
-def writeExclusives(f, encoding, all):
-    for house in range(1, 6):  # houses 1..5
-        for category in all:
-            lits = [encoding[f"{value}_{house}"] for value in category]
+def buildTable(encoding, all):
+    """enc[category][value][house - 1] -> variable id, for dict-free lookups."""
+    return [
+        [[encoding[f"{value}_{house}"] for house in range(1, 6)] for value in category]
+        for category in all
+    ]
 
-            f.write(" ".join(str(v) for v in lits) + " 0\n")
 
-            for i in range(len(lits)):
-                for j in range(i + 1, len(lits)):
-                    f.write(f"-{lits[i]} -{lits[j]} 0\n")
+def exactlyOneLines(lits):
+    """Clause lines: at least one of lits, and no two of them."""
+    yield " ".join(map(str, lits)) + " 0\n"
+    for i, a in enumerate(lits):
+        for b in lits[i + 1:]:
+            yield "%d %d 0\n" % (-a, -b)
 
-    for category in all:
-        for value in category:
-            lits = [encoding[f"{value}_{house}"] for house in range(1, 6)]
 
-            f.write(" ".join(str(v) for v in lits) + " 0\n")
-
-            for i in range(len(lits)):
-                for j in range(i + 1, len(lits)):
-                    f.write(f"-{lits[i]} -{lits[j]} 0\n")
+def writeExclusives(f, enc):
+    # houses x categories, then categories x values: the whole section is
+    # joined into one string and written once
+    groups = [[houses[h] for houses in category] for h in range(5) for category in enc]
+    groups += [houses for category in enc for houses in category]
+    f.write("".join(line for lits in groups for line in exactlyOneLines(lits)))
 
 
 
@@ -113,17 +121,22 @@ def main():
     encoding = buildMap(all_categories)
     numVars = len(encoding)
 
-    # For now, we don't know numClauses ahead of time; you can either
-    # count as you write, or write a dummy header and fix it later.
-    with open(file, "w", encoding="utf-8") as f:
-        # temporary header; you can update numClauses once you count them
-        f.write(f"p cnf {numVars} 0\n")
+    # The encoder emits hundreds of tiny clause strings: collect them in
+    # memory and write the file once (which also gives the real clause
+    # count for the header).
+    buf = io.StringIO()
+
+    # write exclusives
+    writeExclusives(buf, buildTable(encoding, all_categories))
 
-        # write exclusives
-        writeExclusives(f, encoding, all_categories)
+    # write all hint clauses
+    writeHints(buf, encoding)
 
-        # write all hint clauses
-        writeHints(f, encoding)
+    body = buf.getvalue()
+    numClauses = body.count("\n")
+    # one finished blob, one write
+    with open(file, "w") as f:
+        f.write(f"p cnf {numVars} {numClauses}\n{body}")
 
             
 if __name__ == "__main__":
@@ -1,5 +1,19 @@
-# src/fixedModel/FixedModel.py (or wherever you put it)
-import random
+import os
+
+import numpy as np
+
+from src.cnf_flat import random_3sat_flat
+
+# write_dimacs: clauses formatted per write
+_WRITE_BLOCK = 1 << 16
+
+
+def _write_all(fd: int, data: bytes) -> None:
+    """os.write until all of `data` is out (os.write may write partially)."""
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view):]
+
 
 class FixedLength3SAT:
     """
@@ -20,21 +34,45 @@ class FixedLength3SAT:
         self.N = N
         self.seed = seed
 
-        self.clauses: list[list[int]] = []
+        self.clauses_arr: np.ndarray  # (L, 3) int32, one clause per row
+        self._clauses: list[list[int]] | None = None
         self._generate()
 
     def _generate(self) -> None:
-        rng = random.Random(self.seed)
+        # all L clauses in one vectorized draw (3 distinct vars per row)
+        lits, _ = random_3sat_flat(L=self.L, N=self.N, seed=self.seed)
+        self.clauses_arr = lits.reshape(self.L, 3)
 
-        for _ in range(self.L):
-            # 3 distinct vars from 1..N
-            vars_in_clause = rng.sample(range(1, self.N + 1), 3)
-            clause = []
-            for v in vars_in_clause:
-                lit = -v if rng.random() < 0.5 else v
-                clause.append(lit)
-            self.clauses.append(clause)
+    @property
+    def clauses(self) -> list[list[int]]:
+        """Clauses as Python lists, converted from clauses_arr on first use."""
+        if self._clauses is None:
+            self._clauses = self.clauses_arr.tolist()
+        return self._clauses
 
     def getCNFList(self) -> list[list[int]]:
         """Return CNF as list of 3-literal clauses."""
         return self.clauses
+
+    def getCNFArray(self) -> np.ndarray:
+        """Return CNF as an (L, 3) int32 array, one clause per row."""
+        return self.clauses_arr
+
+    def write_dimacs(self, path: str) -> None:
+        """
+        Write the formula to `path` in DIMACS CNF format.
+
+        Clauses are formatted in blocks and each block goes out as one
+        ASCII write, so large L doesn't pay a text-IO round trip per clause.
+        Blocks are already large, so they go straight to the fd with no
+        io buffering layer in between.
+        """
+        clauses = self.clauses_arr
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            _write_all(fd, f"p cnf {self.N} {self.L}\n".encode("ascii"))
+            for i in range(0, len(clauses), _WRITE_BLOCK):
+                block = clauses[i:i + _WRITE_BLOCK].tolist()
+                _write_all(fd, "".join(f"{a} {b} {c} 0\n" for a, b, c in block).encode("ascii"))
+        finally:
+            os.close(fd)
@@ -1,6 +1,13 @@
-import re
-import math
+try:
+    # optional: google-re2 matches without backtracking; the patterns here
+    # only use syntax it shares with the stdlib engine
+    import re2 as re
+except ImportError:
+    import re
+from collections import Counter
+
 import matplotlib.pyplot as plt
+import numpy as np
 
 
 LINE_RE = re.compile(
@@ -18,116 +25,123 @@ def parse_threeway_from_text(text: str):
       data[N][r] = {"static": avg, "random": avg, "two": avg, "count": k}
     If the same (N,r) appears multiple times, values are averaged.
     """
-    # temp accumulator: data[N][r] -> [sum_static, sum_random, sum_two, count]
-    acc = {}
-
-    for raw in text.splitlines():
-        line = raw.strip()
-        if not line:
-            continue
+    # logs repeat lines verbatim: match each distinct line once and carry
+    # its multiplicity as a weight
+    rows, weights = [], []
+    for line, k in Counter(raw.strip() for raw in text.splitlines()).items():
         m = LINE_RE.search(line)
-        if not m:
-            continue
-
-        N = int(m.group("N"))
-        r = float(m.group("r"))
-        s = float(m.group("static"))
-        rnd = float(m.group("random"))
-        two = float(m.group("two"))
-
-        acc.setdefault(N, {})
-        if r not in acc[N]:
-            acc[N][r] = [0.0, 0.0, 0.0, 0]
-        acc[N][r][0] += s
-        acc[N][r][1] += rnd
-        acc[N][r][2] += two
-        acc[N][r][3] += 1
-
-    # finalize averages
+        if m:
+            rows.append(m.groups())
+            weights.append(k)
+    if not rows:
+        return {}
+
+    # bulk float conversion, then per-(N, r) weighted sums via bincount
+    # over the group index from np.unique
+    cols = np.array(rows, dtype=np.float64)          # N, r, static, random, two
+    w = np.array(weights, dtype=np.float64)
+    keys, group = np.unique(cols[:, :2], axis=0, return_inverse=True)
+    group = group.ravel()
+    count = np.bincount(group, weights=w, minlength=len(keys))
+    means = [np.bincount(group, weights=w * cols[:, c], minlength=len(keys)) / count
+             for c in (2, 3, 4)]
+    count = count.astype(np.int64)
+
     data = {}
-    for N in acc:
-        data[N] = {}
-        for r, (ss, rr, tt, k) in acc[N].items():
-            data[N][r] = {
-                "static": ss / k,
-                "random": rr / k,
-                "two": tt / k,
-                "count": k,
-            }
+    for (N, r), s, rnd, two, k in zip(keys.tolist(), *(m.tolist() for m in means),
+                                      count.tolist()):
+        data.setdefault(int(N), {})[r] = {
+            "static": s,
+            "random": rnd,
+            "two": two,
+            "count": k,
+        }
 
     return data
 
 
-def plot_par10(data):
-    """Plot PAR10 curves for static/random/2cl."""
+def _grid(data):
+    """
+    Reshape data[N][r] once into plot-ready arrays.
+
+    Returns:
+      (N_vals, ratios, {"static": Y, "random": Y, "two": Y}) with each Y an
+      ndarray (len(N_vals), len(ratios)), NaN where (N, r) wasn't parsed.
+    """
+    N_vals = sorted(data.keys())
+    ratios = sorted({r for N in data for r in data[N].keys()})
+    col = {r: j for j, r in enumerate(ratios)}
+
+    grid = {k: np.full((len(N_vals), len(ratios)), np.nan) for k in ("static", "random", "two")}
+    for i, N in enumerate(N_vals):
+        for r, row in data[N].items():
+            for k, Y in grid.items():
+                Y[i, col[r]] = row[k]
+    return N_vals, ratios, grid
+
+
+def plot_par10(data, ax=None):
+    """
+    Plot PAR10 curves for static/random/2cl, on `ax` if given, else in a
+    figure of their own.
+    """
     if not data:
         print("No lines parsed.")
         return
 
-    N_vals = sorted(data.keys())
-    ratios = sorted({r for N in data for r in data[N].keys()})
+    N_vals, ratios, grid = _grid(data)
 
-    plt.figure()
-    for N in N_vals:
-        ys = [data[N].get(r, {}).get("static", math.nan) for r in ratios]
-        yr = [data[N].get(r, {}).get("random", math.nan) for r in ratios]
-        y2 = [data[N].get(r, {}).get("two", math.nan) for r in ratios]
-
-        plt.plot(ratios, ys, marker="o", label=f"N={N} static")
-        plt.plot(ratios, yr, marker="o", label=f"N={N} random")
-        plt.plot(ratios, y2, marker="o", label=f"N={N} 2cl")
-
-    plt.xlabel("L/N")
-    plt.ylabel("PAR-10 mean time [s]")
-    plt.title("PAR-10 mean vs clause/variable ratio")
-    plt.grid(True)
-    plt.legend()
-    plt.tight_layout()
-    plt.show()
+    show = ax is None
+    if show:
+        _, ax = plt.subplots(constrained_layout=True)
+    for i, N in enumerate(N_vals):
+        ax.plot(ratios, grid["static"][i], marker="o", label=f"N={N} static")
+        ax.plot(ratios, grid["random"][i], marker="o", label=f"N={N} random")
+        ax.plot(ratios, grid["two"][i], marker="o", label=f"N={N} 2cl")
+
+    ax.set_xlabel("L/N")
+    ax.set_ylabel("PAR-10 mean time [s]")
+    ax.set_title("PAR-10 mean vs clause/variable ratio")
+    ax.grid(True)
+    ax.legend()
+    if show:
+        plt.show()
 
 
-def plot_ratio_curves(data):
+def plot_ratio_curves(data, ax=None):
     """
     Plot ratios:
       static/random and static/2cl vs L/N
-    (Lower is better for static.)
+    (Lower is better for static.) On `ax` if given, else in a figure of
+    their own.
     """
     if not data:
         print("No lines parsed.")
         return
 
-    N_vals = sorted(data.keys())
-    ratios = sorted({r for N in data for r in data[N].keys()})
+    N_vals, ratios, grid = _grid(data)
+    s, rnd, two = grid["static"], grid["random"], grid["two"]
 
-    plt.figure()
-    for N in N_vals:
-        y_sr = []
-        y_s2 = []
-        for r in ratios:
-            row = data[N].get(r)
-            if row is None:
-                y_sr.append(math.nan)
-                y_s2.append(math.nan)
-                continue
-
-            s = row["static"]
-            rnd = row["random"]
-            two = row["two"]
-
-            y_sr.append(s / rnd if rnd > 0 else math.nan)
-            y_s2.append(s / two if two > 0 else math.nan)
-
-        plt.plot(ratios, y_sr, marker="o", label=f"N={N}: static/random")
-        plt.plot(ratios, y_s2, marker="o", label=f"N={N}: static/2cl")
-
-    plt.axhline(1.0)
-    plt.xlabel("L/N")
-    plt.ylabel("PAR-10 ratio (lower = better)")
-    plt.title("Performance ratios vs clause/variable ratio")
-    plt.grid(True)
-    plt.legend()
-    plt.tight_layout()
-    plt.show()
+    # static over each other mode; NaN where the denominator isn't positive
+    # (or the point is missing)
+    y_sr = np.divide(s, rnd, out=np.full_like(s, np.nan), where=rnd > 0)
+    y_s2 = np.divide(s, two, out=np.full_like(s, np.nan), where=two > 0)
+
+    show = ax is None
+    if show:
+        _, ax = plt.subplots(constrained_layout=True)
+    for i, N in enumerate(N_vals):
+        ax.plot(ratios, y_sr[i], marker="o", label=f"N={N}: static/random")
+        ax.plot(ratios, y_s2[i], marker="o", label=f"N={N}: static/2cl")
+
+    ax.axhline(1.0)
+    ax.set_xlabel("L/N")
+    ax.set_ylabel("PAR-10 ratio (lower = better)")
+    ax.set_title("Performance ratios vs clause/variable ratio")
+    ax.grid(True)
+    ax.legend()
+    if show:
+        plt.show()
 
 
 if __name__ == "__main__":
@@ -239,5 +253,8 @@ N=110 r=6.0 | PAR10 static=0.1173 random=18.8859 2cl=0.1342
         for r in rs[:3]:
             print(f"  r={r:.1f} averaged over {data[N][r]['count']} lines")
 
-    plot_par10(data)
-    plot_ratio_curves(data)
+    # both plots side by side in one figure, one show() call
+    fig, (ax_par10, ax_ratio) = plt.subplots(1, 2, figsize=(14, 5), constrained_layout=True)
+    plot_par10(data, ax=ax_par10)
+    plot_ratio_curves(data, ax=ax_ratio)
+    plt.show()
@@ -1,6 +1,11 @@
-import re
-import math
+try:
+    # optional: google-re2 matches without backtracking; the patterns here
+    # only use syntax it shares with the stdlib engine
+    import re2 as re
+except ImportError:
+    import re
 import matplotlib.pyplot as plt
+import numpy as np
 
 LINE_RE = re.compile(
     r"N=(?P<N>\d+),\s*r=(?P<r>\d+(?:\.\d+)?),\s*L=(?P<L>\d+),\s*tl=(?P<tl>\d+(?:\.\d+)?)s\s*\|\s*"
@@ -15,108 +20,91 @@ def parse_results_from_text(text: str):
     """
     Parse printed solver output into results[N][r] dict.
     """
-    results = {}
-    for raw in text.splitlines():
-        line = raw.strip()
-        if not line:
-            continue
-        m = LINE_RE.search(line)
-        if not m:
-            continue
-
-        N = int(m.group("N"))
-        r = float(m.group("r"))
+    # one regex pass over the whole text, then bulk float conversion of all
+    # captured columns (N, r, L, tl, median, par10, to, solved, sat)
+    rows = LINE_RE.findall(text)
+    if not rows:
+        return {}
+    cols = np.array(rows, dtype=np.float64).T
+    Ns = cols[0].astype(np.int64).tolist()
+    Ls = cols[2].astype(np.int64).tolist()
+    rs, tl, median, par10, to, solved, sat = (c.tolist() for c in cols[[1, 3, 4, 5, 6, 7, 8]])
 
+    results = {}
+    for k, N in enumerate(Ns):
         results.setdefault(N, {})
-        results[N][r] = {
-            "L": int(m.group("L")),
-            "time_limit": float(m.group("tl")),
-            "median_time_solved": float(m.group("median")),
-            "par10_mean": float(m.group("par10")),
-            "timeout_rate": float(m.group("to")),
-            "solved_rate": float(m.group("solved")),
-            "sat_rate_among_solved": float(m.group("sat")),
+        results[N][rs[k]] = {
+            "L": Ls[k],
+            "time_limit": tl[k],
+            "median_time_solved": median[k],
+            "par10_mean": par10[k],
+            "timeout_rate": to[k],
+            "solved_rate": solved[k],
+            "sat_rate_among_solved": sat[k],
         }
     return results
 
 
-def plot_results(results):
-    N_vals = sorted(results.keys())
-    ratios = sorted({r for N in results for r in results[N].keys()})
-
-    def series(N, key):
-        return [results[N].get(r, {}).get(key, math.nan) for r in ratios]
-
-    # Median solved runtime
-    plt.figure()
-    for N in N_vals:
-        plt.plot(ratios, series(N, "median_time_solved"), marker="o", label=f"N={N}")
-    plt.xlabel("L/N")
-    plt.ylabel("Median runtime (solved only) [s]")
-    plt.title("Median solved runtime vs clause/variable ratio")
-    plt.grid(True)
-    plt.legend()
-    plt.tight_layout()
+def _plot_metric(ax, N_vals, ratios, Y, ylabel, title, ylim=None, linestyle="-"):
+    """Draw one metric (rows of Y, one per N) against L/N into `ax`."""
+    for N, y in zip(N_vals, Y):
+        ax.plot(ratios, y, marker="o", linestyle=linestyle, label=f"N={N}")
+    ax.set_xlabel("L/N")
+    ax.set_ylabel(ylabel)
+    if ylim is not None:
+        ax.set_ylim(*ylim)
+    ax.set_title(title)
+    ax.grid(True)
+    ax.legend()
 
-    # PAR10 mean
-    plt.figure()
-    for N in N_vals:
-        plt.plot(ratios, series(N, "par10_mean"), marker="o", label=f"N={N}")
-    plt.xlabel("L/N")
-    plt.ylabel("PAR-10 mean [s]")
-    plt.title("PAR-10 mean vs clause/variable ratio")
-    plt.grid(True)
-    plt.legend()
-    plt.tight_layout()
 
-    # Timeout rate
-    plt.figure()
-    for N in N_vals:
-        plt.plot(ratios, series(N, "timeout_rate"), marker="o", label=f"N={N}")
-    plt.xlabel("L/N")
-    plt.ylabel("Timeout rate")
-    plt.ylim(-0.05, 1.05)
-    plt.title("Timeout rate vs clause/variable ratio")
-    plt.grid(True)
-    plt.legend()
-    plt.tight_layout()
-
-    # Solved rate
-    plt.figure()
-    for N in N_vals:
-        plt.plot(ratios, series(N, "solved_rate"), marker="o", label=f"N={N}")
-    plt.xlabel("L/N")
-    plt.ylabel("Solved rate")
-    plt.ylim(-0.05, 1.05)
-    plt.title("Solved rate vs clause/variable ratio")
-    plt.grid(True)
-    plt.legend()
-    plt.tight_layout()
-
-    # SAT among solved
-    plt.figure()
-    for N in N_vals:
-        plt.plot(ratios, series(N, "sat_rate_among_solved"), marker="o", label=f"N={N}")
-    plt.xlabel("L/N")
-    plt.ylabel("SAT fraction among solved")
-    plt.ylim(-0.05, 1.05)
-    plt.title("SAT fraction among solved vs clause/variable ratio")
-    plt.grid(True)
-    plt.legend()
-    plt.tight_layout()
-
-    # Time limit used
-    plt.figure()
-    for N in N_vals:
-        plt.plot(ratios, series(N, "time_limit"), marker="o", linestyle="--", label=f"N={N}")
-    plt.xlabel("L/N")
-    plt.ylabel("Time limit used [s]")
-    plt.title("Time limit vs ratio")
-    plt.grid(True)
-    plt.legend()
-    plt.tight_layout()
+def plot_results(results, path=None):
+    """
+    Draw the results[N][r] rows as one 2x3 figure. Shown interactively, or
+    written to `path` (e.g. "results.png") when given.
+    """
+    N_vals = sorted(results.keys())
+    ratios = sorted({r for N in results for r in results[N].keys()})
 
-    plt.show()
+    # reshape once into one (len(N_vals), len(ratios)) array per metric,
+    # NaN where (N, r) wasn't parsed
+    keys = ("median_time_solved", "par10_mean", "timeout_rate", "solved_rate",
+            "sat_rate_among_solved", "time_limit")
+    row = {N: i for i, N in enumerate(N_vals)}
+    col = {r: j for j, r in enumerate(ratios)}
+    cells = [(row[N], col[r], [vals[k] for k in keys])
+             for N in N_vals for r, vals in results[N].items()]
+    stacked = np.full((len(keys), len(N_vals), len(ratios)), np.nan)
+    if cells:
+        i, j, v = zip(*cells)
+        stacked[:, i, j] = np.array(v, dtype=np.float64).T
+    grid = dict(zip(keys, stacked))
+
+    # one figure, one panel per metric:
+    # (key, ylabel, title, ylim, linestyle)
+    panels = [
+        ("median_time_solved", "Median runtime (solved only) [s]",
+         "Median solved runtime vs clause/variable ratio", None, "-"),
+        ("par10_mean", "PAR-10 mean [s]",
+         "PAR-10 mean vs clause/variable ratio", None, "-"),
+        ("timeout_rate", "Timeout rate",
+         "Timeout rate vs clause/variable ratio", (-0.05, 1.05), "-"),
+        ("solved_rate", "Solved rate",
+         "Solved rate vs clause/variable ratio", (-0.05, 1.05), "-"),
+        ("sat_rate_among_solved", "SAT fraction among solved",
+         "SAT fraction among solved vs clause/variable ratio", (-0.05, 1.05), "-"),
+        ("time_limit", "Time limit used [s]",
+         "Time limit vs ratio", None, "--"),
+    ]
+    fig, axes = plt.subplots(2, 3, figsize=(18, 9), constrained_layout=True)
+    for ax, (key, ylabel, title, ylim, linestyle) in zip(axes.flat, panels):
+        _plot_metric(ax, N_vals, ratios, grid[key], ylabel, title, ylim, linestyle)
+
+    if path is None:
+        plt.show()
+    else:
+        fig.savefig(path, dpi=120)
+        plt.close(fig)
 
 
 if __name__ == "__main__":
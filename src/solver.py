@@ -1,174 +1,308 @@
-import statistics as stats
+import argparse
 import math
-import matplotlib.pyplot as plt
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+import numpy as np
 
-from src.cnf_flat import random_3sat_flat
+from src.cnf_flat import random_3sat_flat, random_3sat_flat_batch
 from src.DPLL.DPLLFast import DPLLFast
 
 
-def pilot_time_limit(N, r, pilot_trials=30, start_limit=0.5, max_limit=30.0, grow=2.0):
+def _warmup() -> None:
+    """
+    Solve a tiny instance once so one-time costs (extension import, first
+    numpy/kernel calls) land here and not in the first measured trial.
+    Used as the pool initializer, so it runs once per worker process.
+    """
+    lits, offsets = random_3sat_flat_batch(10, 5, 1, seed=0)
+    DPLLFast(lits[0], offsets, num_vars=5).solve(time_limit=0.01)
+
+
+def pilot_time_limit(N, r, pilot_trials=30, start_limit=0.5, max_limit=30.0, grow=2.0,
+                     seed=None):
     """
     Pick a time limit so that fewer than 50% of pilot instances time out.
     This helps ensure the *median of solved times* isn't dominated by timeouts,
     and avoids the median being clipped to the timeout value.
 
+    The pilot instances are drawn once (from `seed`) and reused at every
+    limit. An instance solved within a limit is solved within any larger
+    one, so each round only reruns the ones that timed out, and a round
+    stops as soon as half of the instances have timed out.
+
     Returns:
         float: chosen time limit in seconds
     """
+    _warmup()
     limit = start_limit
     L = int(N * r)
+    instances, offsets = random_3sat_flat_batch(L, N, pilot_trials, seed=seed)
+    pending = list(range(pilot_trials))  # not yet solved within a limit
+    solver = None  # one DPLLFast, reloaded per instance
 
     while limit <= max_limit:
-        timeouts = 0
-        times = []
+        timed_out = []
 
-        for _ in range(pilot_trials):
-            lits, offsets = random_3sat_flat(L=L, N=N, seed=None)
-            solver = DPLLFast(lits, offsets, num_vars=N)
+        for k, t in enumerate(pending):
+            if solver is None:
+                solver = DPLLFast(instances[t], offsets, num_vars=N)
+            else:
+                solver.load(instances[t])
             solver.solve(time_limit=limit)
-            times.append(solver.solve_time)
-            if solver.solve_time >= limit:
-                timeouts += 1
-
-        timeout_rate = timeouts / pilot_trials
+            if solver.timed_out:
+                timed_out.append(t)
+                # Condition already failed: at least half time out
+                if 2 * len(timed_out) >= pilot_trials:
+                    timed_out += pending[k + 1:]
+                    break
 
         # Condition: fewer than half time out
-        if timeout_rate < 0.5:
+        if 2 * len(timed_out) < pilot_trials:
             return limit
 
+        pending = timed_out
         limit *= grow
 
     return max_limit
 
 
-def run_experiment():
-    N_vals = [100, 125]
-    ratios = [i / 10 for i in range(30, 62, 2)]  # 3.0..6.0 step 0.2
-    num_trials = 100
-    tl = 5.0
-    results = {N: {} for N in N_vals}
+def _solve_trial(solver, time_limit):
+    """
+    Solve the instance loaded into `solver` (a DPLLFast reused across
+    trials, see DPLLFast.load) once.
+
+    Returns:
+      (solve_time, split_count, is_sat, timed_out), timed_out as reported
+      by the solver (a run that decides its instance just past the limit
+      is not a timeout)
+    """
+    model = solver.solve(time_limit=time_limit)
+    return solver.solve_time, solver.split_count, model is not None, solver.timed_out
+
+
+def _is_stable(times, timed_out, tol=0.05, min_trials=30, z=1.96) -> bool:
+    """
+    True once more trials are unlikely to move the (N, r) summary: at least
+    `min_trials` ran, the median solved time of the last 10 solved trials is
+    within `tol` (relative) of that of the last 20, and the Wilson interval
+    of the timeout rate has half-width < 0.05.
+
+    times, timed_out: per-trial arrays, in trial order.
+    """
+    n = len(times)
+    if n < min_trials:
+        return False
+    solved = times[~timed_out]
+    if len(solved) < 20:
+        return False
+    m10, m20 = np.median(solved[-10:]), np.median(solved[-20:])
+    if abs(m10 - m20) >= tol * m20:
+        return False
+    p = timed_out.mean()
+    half = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / (1 + z * z / n)
+    return half < 0.05
+
+
+def _trial_seeds(base_seed, N, num_trials):
+    """
+    Per-trial instance seeds for size N, shared by every ratio: trial t at
+    each r is drawn from the same seed (common random numbers), so
+    differences across ratios reflect the ratio rather than the draw.
+    """
+    return [int(ss.generate_state(1)[0])
+            for ss in np.random.SeedSequence([base_seed, N]).spawn(num_trials)]
+
+
+def _cell_path(out_dir, N, r):
+    return os.path.join(out_dir, f"{N}_{r:g}.npz")
+
+
+def _save_row(path, row) -> None:
+    """Write one results[N][r] row as .npz, atomically (tmp file + rename)."""
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        np.savez(f, **row)
+    os.replace(tmp, path)
+
 
-    for N in N_vals:
-
-        for r in ratios:
-            # tl = pilot_time_limit(N, r, pilot_trials=30, start_limit=0.5, max_limit=30.0, grow=2.0)
-            L = int(N * r)
-
-            sats = 0
-            unsats = 0
-            timeouts = 0
-
-            solved_times = []
-            solved_splits = []
-
-            par10_times = []
-
-            for t in range(num_trials):
-                lits, offsets = random_3sat_flat(L=L, N=N, seed=None)
-
-                solver = DPLLFast(lits, offsets, num_vars=N)
-                model = solver.solve(time_limit=tl)
-
-                # PAR-10 accounting
-                if solver.solve_time >= tl:
-                    par10_times.append(10.0 * tl)
-                else:
-                    par10_times.append(solver.solve_time)
-
-                if model is None and solver.solve_time >= tl:
-                    timeouts += 1
-                elif model is None:
-                    unsats += 1
-                    solved_times.append(solver.solve_time)
-                    solved_splits.append(solver.split_count)
-                else:
-                    sats += 1
-                    solved_times.append(solver.solve_time)
-                    solved_splits.append(solver.split_count)
-
-                # if (t + 1) % 10 == 0:
-                #     print(f"  r={r:.1f} trial {t+1}/{num_trials}", flush=True)
-
-            solved = sats + unsats
-            solved_rate = solved / num_trials
-            timeout_rate = timeouts / num_trials
-            sat_rate_among_solved = (sats / solved) if solved > 0 else float("nan")
-
-            median_time_solved = stats.median(solved_times) if solved_times else float("nan")
-            median_splits_solved = stats.median(solved_splits) if solved_splits else float("nan")
-            par10_mean = (sum(par10_times) / len(par10_times)) if par10_times else float("nan")
-
-            results[N][r] = {
-                "time_limit": tl,
-                "median_time_solved": median_time_solved,
-                "median_splits_solved": median_splits_solved,
-                "solved_rate": solved_rate,
-                "timeout_rate": timeout_rate,
-                "sat_rate_among_solved": sat_rate_among_solved,
-                "par10_mean": par10_mean,
-                "sats": sats,
-                "unsats": unsats,
-                "timeouts": timeouts,
-            }
+def _load_row(path):
+    """Inverse of _save_row: scalars come back as Python numbers."""
+    with np.load(path) as z:
+        return {k: z[k].item() if z[k].ndim == 0 else z[k] for k in z.files}
+
+
+def load_results(out_dir):
+    """
+    Read the rows a run_experiment(out_dir=...) sweep has written so far.
+
+    Returns:
+      results[N][r] dicts, as returned by run_experiment
+    """
+    results = {}
+    for name in sorted(os.listdir(out_dir)):
+        if not name.endswith(".npz"):
+            continue
+        N, r = name[:-len(".npz")].split("_")
+        results.setdefault(int(N), {})[float(r)] = _load_row(os.path.join(out_dir, name))
+    return results
+
+
+def _run_cell(N, r, num_trials, tl, base_seed, batch_size, out_dir=None):
+    """
+    Worker: run the trials of one (N, r) point, in order, in this process.
+
+    Trial t's instance comes from _trial_seeds(base_seed, N, ...)[t], the
+    same seed at every ratio, so a run is reproducible and results at
+    different r are paired trial by trial ("solve_times"). Every
+    `batch_size` trials the point is checked for stability (see _is_stable)
+    and the remaining trials are skipped once it is; batch_size=None always
+    runs num_trials. With `out_dir`, the row is also saved there as soon as
+    the point is done (see _save_row), together with the arguments it was
+    run with.
+
+    Returns:
+      the results[N][r] dict
+    """
+    L = int(N * r)
+
+    # per-trial outcomes, filled in place
+    times = np.empty(num_trials)
+    splits = np.empty(num_trials, dtype=np.int64)
+    is_sat = np.empty(num_trials, dtype=bool)
+    timed_out = np.empty(num_trials, dtype=bool)
+
+    seeds = _trial_seeds(base_seed, N, num_trials)
+    solver = None
+
+    done = 0
+    while done < num_trials:
+        lits, offsets = random_3sat_flat(L=L, N=N, seed=seeds[done])
+        if solver is None:
+            solver = DPLLFast(lits, offsets, num_vars=N)
+        else:
+            solver.load(lits, offsets)
+        times[done], splits[done], is_sat[done], timed_out[done] = _solve_trial(solver, tl)
+        done += 1
+
+        if batch_size and done % batch_size == 0 and \
+                _is_stable(times[:done], timed_out[:done]):
+            break
+
+    times, splits, is_sat = times[:done], splits[:done], is_sat[:done]
+    timed_out = timed_out[:done]
+    solved_mask = ~timed_out
+
+    sats = int(is_sat.sum())
+    timeouts = int(timed_out.sum())
+    solved = done - timeouts
+    unsats = solved - sats
+    solved_rate = solved / done
+    timeout_rate = timeouts / done
+    sat_rate_among_solved = (sats / solved) if solved > 0 else float("nan")
+
+    median_time_solved = float(np.median(times[solved_mask])) if solved else float("nan")
+    median_splits_solved = float(np.median(splits[solved_mask])) if solved else float("nan")
+    # PAR-10: timed-out runs score 10x the limit; the same mask as the
+    # rates and medians above
+    par10_mean = float(np.where(timed_out, 10.0 * tl, times).mean()) if done else float("nan")
+
+    row = {
+        "time_limit": tl,
+        "median_time_solved": median_time_solved,
+        "median_splits_solved": median_splits_solved,
+        "solved_rate": solved_rate,
+        "timeout_rate": timeout_rate,
+        "sat_rate_among_solved": sat_rate_among_solved,
+        "par10_mean": par10_mean,
+        "sats": sats,
+        "unsats": unsats,
+        "timeouts": timeouts,
+        "n_trials_used": done,
+        "solve_times": times,
+        # the arguments this row was run with, checked before resuming
+        "num_trials": num_trials,
+        "base_seed": base_seed,
+        "batch_size": batch_size or 0,
+    }
+    if out_dir is not None:
+        _save_row(_cell_path(out_dir, N, r), row)
+    return row
+
+
+def run_experiment(N_vals=(100, 125), ratios=None, num_trials=100, tl=5.0,
+                   base_seed=12345, workers=None, batch_size=10, out_dir=None):
+    """
+    The (N, r) points are independent, so whole points are fanned out over
+    a process pool (`workers` processes, default os.cpu_count()), each
+    running its trials sequentially (see _run_cell). Results are collected
+    and printed in grid order.
+
+    With `out_dir`, each worker writes its point to `{out_dir}/{N}_{r}.npz`
+    when done, and points already there are loaded instead of rerun, so an
+    interrupted sweep resumes where it stopped. A saved point run with a
+    different tl, num_trials, base_seed or batch_size is rerun (and
+    overwritten) instead. load_results(out_dir) reads the rows back.
+    """
+    if ratios is None:
+        ratios = [i / 10 for i in range(30, 62, 2)]  # 3.0..6.0 step 0.2
+    results = {N: {} for N in N_vals}
+    workers = workers or os.cpu_count() or 1
+
+    cells = [(N, r) for N in N_vals for r in ratios]
+    done = {}  # (N, r) -> row resumed from out_dir
+    if out_dir is not None:
+        os.makedirs(out_dir, exist_ok=True)
+        args = {"time_limit": tl, "num_trials": num_trials, "base_seed": base_seed,
+                "batch_size": batch_size or 0}
+        for c in cells:
+            path = _cell_path(out_dir, *c)
+            if os.path.exists(path):
+                row = _load_row(path)
+                if all(row.get(k) == v for k, v in args.items()):
+                    done[c] = row
+    todo = [c for c in cells if c not in done]
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_warmup) as pool:
+        rows = pool.map(
+            _run_cell, [N for N, _ in todo], [r for _, r in todo],
+            repeat(num_trials), repeat(tl), repeat(base_seed), repeat(batch_size),
+            repeat(out_dir),
+        )
+        for N, r in cells:
+            row = done[N, r] if (N, r) in done else next(rows)
+            results[N][r] = row
 
             print(
-                f"N={N}, r={r:.1f}, L={L}, tl={tl:.2f}s | "
-                f"median(solved)={median_time_solved:.4f}s, "
-                f"PAR10_mean={par10_mean:.4f}s, "
-                f"timeout_rate={timeout_rate:.2f}, solved_rate={solved_rate:.2f}, "
-                f"SAT|solved={sat_rate_among_solved:.2f}",
+                f"N={N}, r={r:.1f}, L={int(N * r)}, tl={tl:.2f}s | "
+                f"median(solved)={row['median_time_solved']:.4f}s, "
+                f"PAR10_mean={row['par10_mean']:.4f}s, "
+                f"timeout_rate={row['timeout_rate']:.2f}, solved_rate={row['solved_rate']:.2f}, "
+                f"SAT|solved={row['sat_rate_among_solved']:.2f}, "
+                f"trials={row['n_trials_used']}",
                 flush=True
             )
 
     return results, ratios
 
 
-def plot_results(results, ratios):
-    N_vals = sorted(results.keys())
-
-    # Median solved runtime
-    plt.figure()
-    for N in N_vals:
-        y = [results[N][r]["median_time_solved"] for r in ratios]
-        plt.plot(ratios, y, marker="o", label=f"N={N}")
-    plt.xlabel("L/N")
-    plt.ylabel("Median runtime (solved only) [s]")
-    plt.title("Median solved runtime vs clause/variable ratio")
-    plt.legend()
-    plt.grid(True)
-    plt.tight_layout()
-
-    # Timeout rate
-    plt.figure()
-    for N in N_vals:
-        y = [results[N][r]["timeout_rate"] for r in ratios]
-        plt.plot(ratios, y, marker="o", label=f"N={N}")
-    plt.xlabel("L/N")
-    plt.ylabel("Timeout rate")
-    plt.title("Timeout rate vs clause/variable ratio")
-    plt.ylim(-0.05, 1.05)
-    plt.legend()
-    plt.grid(True)
-    plt.tight_layout()
-
-    # PAR-10 mean
-    plt.figure()
-    for N in N_vals:
-        y = [results[N][r]["par10_mean"] for r in ratios]
-        plt.plot(ratios, y, marker="o", label=f"N={N}")
-    plt.xlabel("L/N")
-    plt.ylabel("PAR-10 mean time [s]")
-    plt.title("PAR-10 mean vs clause/variable ratio")
-    plt.legend()
-    plt.grid(True)
-    plt.tight_layout()
-
-    plt.show()
-
-
 def main():
-    results, ratios = run_experiment()
-    plot_results(results, ratios)
+    parser = argparse.ArgumentParser(description="Random 3-SAT sweep with DPLLFast.")
+    parser.add_argument("--show", action="store_true",
+                        help="show the plots in a window instead of saving them")
+    parser.add_argument("--plot", default="solver_results.png",
+                        help="where to save the plots (default: %(default)s)")
+    args = parser.parse_args()
+
+    # pyplot is only needed here, once the sweep is done; without --show
+    # use the non-interactive backend so no GUI toolkit is loaded
+    if not args.show:
+        import matplotlib
+        matplotlib.use("Agg")
+    from src.plot_results import plot_results
+
+    results, _ = run_experiment()
+    plot_results(results, path=None if args.show else args.plot)
 
 
 if __name__ == "__main__":
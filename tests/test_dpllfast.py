@@ -0,0 +1,19 @@
+import numpy as np
+
+from src.cnf_flat import flatten_clauses
+from src.DPLL.DPLLFast import DPLLFast
+
+
+def test_empty_formula_is_sat():
+    for mode in ("static", "random", "2clause"):
+        solver = DPLLFast(np.zeros(0, np.int32), np.array([0], np.int32), num_vars=3)
+        model = solver.solve(branch_mode=mode, seed=1)
+        assert model is not None and set(model) == {1, 2, 3}
+        assert not solver.timed_out
+
+
+def test_only_empty_clauses_has_nothing_to_watch():
+    lits, offsets = flatten_clauses([[], []])
+    solver = DPLLFast(lits, offsets, num_vars=3)
+    assert len(solver.node_clause) == 0
+    assert solver.solve() is not None